@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Shared access to decoded audio.
+Each source recording is decoded through ffmpeg once into the memory-mapped
+PCM cache (pcm_cache.py) and every clip is sliced from that, in this and
+later runs. When only a short range of a file that has never been decoded is
+needed, load_audio_range() seeks and decodes just that range instead.
+"""
+
+import math
+import os
+import subprocess
+
+from pydub import AudioSegment
+from pydub.utils import get_encoder_name, mediainfo_json
+
+# (absolute path, mtime_ns) -> ffprobe info for the first audio stream
+_PROBE_CACHE = {}
+
+# Codecs that ffprobe reports as fltp but pydub decodes to 16-bit
+COMPRESSED_CODECS = {'mp3', 'mp4', 'aac', 'webm', 'ogg'}
+
+# Extra audio decoded before a seek point and thrown away, so the decoder
+# has settled by the first sample we keep
+SEEK_PREROLL_MS = 200
+
+
+def load_audio(audio_file):
+    """
+    Return the decoded audio for a file, decoding it only once.
+
+    The audio is memory-mapped from the PCM cache. It slices like an
+    AudioSegment (audio[start_ms:end_ms] returns an AudioSegment, len() is in
+    milliseconds), but only the slices taken are ever read into memory.
+
+    Args:
+        audio_file: Path to the audio file
+
+    Returns:
+        pcm_cache.PCMAudio for the whole file
+    """
+    from pcm_cache import open_pcm
+    return open_pcm(audio_file)
+
+
+def clear_audio_cache():
+    """Close every memory-mapped recording opened by this process."""
+    from pcm_cache import close_all
+    close_all()
+
+
+def _probe_stream(audio_file):
+    """ffprobe info for an audio file's first audio stream, cached per mtime."""
+    path = os.path.abspath(str(audio_file))
+    key = (path, os.stat(path).st_mtime_ns)
+
+    if key not in _PROBE_CACHE:
+        info = mediainfo_json(path)
+        _PROBE_CACHE[key] = next(s for s in info['streams'] if s.get('codec_type') == 'audio')
+
+    return _PROBE_CACHE[key]
+
+
+def probe_audio(audio_file):
+    """
+    Return (frame_rate, channels) of an audio file's first audio stream.
+
+    Args:
+        audio_file: Path to the audio file
+    """
+    stream = _probe_stream(audio_file)
+    return int(stream['sample_rate']), int(stream['channels'])
+
+
+def probe_sample_width(audio_file):
+    """
+    Return the sample width in bytes that pydub would decode a file to.
+
+    Compressed sources (m4a, mp3) decode to 16-bit. Sources with more than
+    16 bits per sample (24-bit or float WAV, 24-bit FLAC) decode to 32-bit,
+    as pydub widens 24-bit audio, so no precision is lost.
+
+    Args:
+        audio_file: Path to the audio file
+    """
+    stream = _probe_stream(audio_file)
+    if stream.get('sample_fmt') == 'fltp' and stream.get('codec_name') in COMPRESSED_CODECS:
+        return 2
+    bits = int(stream.get('bits_per_raw_sample') or stream.get('bits_per_sample') or 0)
+    return 4 if bits > 16 else 2
+
+
+def pcm_format_args(sample_width):
+    """ffmpeg output arguments for raw signed little-endian PCM of a width."""
+    bits = sample_width * 8
+    return ['-f', f's{bits}le', '-acodec', f'pcm_s{bits}le']
+
+
+def load_audio_range(audio_file, start_ms, end_ms):
+    """
+    Decode only part of an audio file.
+
+    ffmpeg seeks to just before start_ms and decodes only the requested
+    duration, so memory and time do not depend on the recording's length.
+    Frames are counted the same way pydub slices and audio is decoded at the
+    sample width pydub would use (probe_sample_width()), so the result
+    matches load_audio(audio_file)[start_ms:end_ms].
+
+    Args:
+        audio_file: Path to the audio file
+        start_ms: Start of the range in milliseconds
+        end_ms: End of the range in milliseconds (clamped to the file length)
+
+    Returns:
+        AudioSegment for the requested range
+    """
+    from pcm_cache import cached_pcm
+
+    # Already decoded once: slicing the PCM cache is cheaper than any seek
+    pcm = cached_pcm(audio_file)
+    if pcm is not None:
+        return pcm[start_ms:end_ms]
+
+    frame_rate, channels = probe_audio(audio_file)
+    sample_width = probe_sample_width(audio_file)
+    frame_width = sample_width * channels
+
+    # Same frame arithmetic as AudioSegment.__getitem__
+    start_frame = int(max(0, start_ms) * (frame_rate / 1000.0))
+    end_frame = int(max(0, end_ms) * (frame_rate / 1000.0))
+    frame_count = max(0, end_frame - start_frame)
+
+    preroll_frames = min(start_frame, int(SEEK_PREROLL_MS * frame_rate / 1000))
+    seek_frame = start_frame - preroll_frames
+
+    # Round the seek time down to the microsecond so ffmpeg's accurate seek
+    # starts exactly at seek_frame
+    seek_seconds = math.floor(seek_frame * 1_000_000 / frame_rate) / 1_000_000
+    duration_seconds = (preroll_frames + frame_count + 1) / frame_rate
+
+    command = [
+        get_encoder_name(), '-v', 'error',
+        '-ss', f"{seek_seconds:.6f}",
+        '-i', str(audio_file),
+        '-t', f"{duration_seconds:.6f}",
+        '-vn',
+        *pcm_format_args(sample_width),
+        '-ac', str(channels), '-ar', str(frame_rate),
+        '-'
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {audio_file}: {result.stderr.decode(errors='replace')}")
+
+    start_byte = preroll_frames * frame_width
+    data = result.stdout[start_byte:start_byte + frame_count * frame_width]
+
+    return AudioSegment(
+        data=data,
+        sample_width=sample_width,
+        frame_rate=frame_rate,
+        channels=channels
+    )
+
+
+def load_pcm_range(audio_file, start_ms, end_ms, sample_rate=16000):
+    """
+    Decode part of an audio file as mono float32 samples for Whisper.
+
+    Matches whisper.load_audio() (16-bit mono, scaled to [-1, 1]) but only
+    decodes the requested range.
+
+    Args:
+        audio_file: Path to the audio file
+        start_ms: Start of the range in milliseconds
+        end_ms: End of the range in milliseconds
+        sample_rate: Output sample rate (Whisper expects 16000)
+
+    Returns:
+        numpy float32 array of samples
+    """
+    import numpy as np
+
+    start_seconds = max(0, start_ms) / 1000
+    duration_seconds = max(0, end_ms - max(0, start_ms)) / 1000
+
+    command = [
+        get_encoder_name(), '-v', 'error',
+        '-ss', f"{start_seconds:.6f}",
+        '-i', str(audio_file),
+        '-t', f"{duration_seconds:.6f}",
+        '-vn',
+        '-f', 's16le', '-acodec', 'pcm_s16le',
+        '-ac', '1', '-ar', str(sample_rate),
+        '-'
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {audio_file}: {result.stderr.decode(errors='replace')}")
+
+    return np.frombuffer(result.stdout, np.int16).flatten().astype(np.float32) / 32768.0
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Snap clip boundaries to quiet gaps.
+Instead of a fixed padding, each cut is moved into the nearest quiet gap
+within a search radius of the matched words (before the first word, after
+the last), at the middle of the gap and on a zero crossing, so clips keep
+their breaths without bleeding into the neighbouring words. Only a short
+window around each cut is decoded.
+"""
+
+import numpy as np
+
+from audio_cache import load_audio_range
+
+# Energy is measured over frames of this length
+FRAME_MS = 10
+
+# A frame only counts as a gap if its RMS is at most this fraction of the
+# loudest frame in the search window
+QUIET_RATIO = 0.25
+
+
+def _mono_samples(segment):
+    """Return an AudioSegment's samples as a mono float array."""
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    if segment.channels > 1:
+        samples = samples[:len(samples) - len(samples) % segment.channels]
+        samples = samples.reshape(-1, segment.channels).mean(axis=1)
+    return samples
+
+
+def frame_rms(samples, frame_len):
+    """RMS energy of consecutive frames (a trailing partial frame is dropped)."""
+    count = len(samples) // frame_len
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:count * frame_len].reshape(count, frame_len)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def find_gap(segment, target_ms, frame_ms=FRAME_MS):
+    """
+    Find the quiet gap in a window of audio closest to a target.
+
+    Args:
+        segment: AudioSegment covering the search window
+        target_ms: Offset within the window to stay close to
+        frame_ms: Energy frame length
+
+    Returns:
+        Offset in milliseconds of a zero crossing in the middle of the
+        nearest gap, or None if no frame is quiet enough to be a gap
+    """
+    samples = _mono_samples(segment)
+    frame_len = max(1, int(segment.frame_rate * frame_ms / 1000))
+    rms = frame_rms(samples, frame_len)
+    if len(rms) == 0 or rms.max() == 0:
+        return None if len(rms) == 0 else float(target_ms)
+
+    quiet = rms <= rms.max() * QUIET_RATIO
+    if not quiet.any():
+        return None
+
+    # Runs of consecutive quiet frames, as [first, last] frame pairs
+    edges = np.diff(np.concatenate(([0], quiet.astype(np.int8), [0])))
+    runs = np.stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1], axis=1)
+
+    # The gap nearest the target, cut in its middle so the pause is shared
+    # between this clip and the neighbouring words
+    run_starts_ms = runs[:, 0] * frame_ms
+    run_ends_ms = (runs[:, 1] + 1) * frame_ms
+    distance = np.maximum(0, np.maximum(run_starts_ms - target_ms, target_ms - run_ends_ms))
+    first, last = runs[np.argmin(distance)]
+    frame = (first + last) // 2
+    centre_ms = (frame + 0.5) * frame_ms
+
+    # Zero crossing nearest the frame's centre
+    lo = frame * frame_len
+    chunk = samples[lo:lo + frame_len + 1]
+    crossings = np.flatnonzero(np.signbit(chunk[:-1]) != np.signbit(chunk[1:]))
+    if len(crossings) == 0:
+        return float(centre_ms)
+    crossing = crossings[np.argmin(np.abs(crossings - frame_len / 2))]
+    return (lo + crossing + 1) * 1000.0 / segment.frame_rate
+
+
+def _window(audio_file, start_ms, end_ms, audio=None):
+    if audio is not None:
+        return audio[start_ms:end_ms]
+    return load_audio_range(audio_file, start_ms, end_ms)
+
+
+def snap_boundaries(audio_file, start_ms, end_ms, radius_ms=500, audio=None, length_ms=None):
+    """
+    Move a clip's start and end into the nearest quiet gaps.
+
+    The start is searched for in the radius before start_ms and the end in
+    the radius after end_ms. A boundary with no quiet gap in its radius falls
+    back to a fixed padding of radius_ms.
+
+    Args:
+        audio_file: Path to the source recording
+        start_ms: Start of the first matched word
+        end_ms: End of the last matched word
+        radius_ms: How far to search on each side (and the fallback padding)
+        audio: Already-loaded recording from load_audio(), if there is one
+        length_ms: Length of the recording, to clamp the end
+
+    Returns:
+        (start_ms, end_ms) of the snapped clip, as ints
+    """
+    if audio is not None:
+        length_ms = len(audio)
+
+    window_start = max(0, int(start_ms) - radius_ms)
+    gap = find_gap(_window(audio_file, window_start, int(start_ms), audio), start_ms - window_start)
+    snapped_start = window_start + gap if gap is not None else start_ms - radius_ms
+
+    window_end = int(end_ms) + radius_ms
+    if length_ms is not None:
+        window_end = min(window_end, length_ms)
+    gap = find_gap(_window(audio_file, int(end_ms), window_end, audio), 0)
+    snapped_end = int(end_ms) + gap if gap is not None else end_ms + radius_ms
+
+    snapped_start = max(0, int(round(snapped_start)))
+    snapped_end = int(round(snapped_end))
+    if length_ms is not None:
+        snapped_end = min(snapped_end, length_ms)
+
+    return snapped_start, snapped_end
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Point the HTML clip players at the compressed renditions.
+Every <audio> tag whose WAV is in renditions.json gets its Opus and AAC
+sources listed ahead of the WAV, so browsers fetch the small file and only
+fall back to the master. Re-running after a new export updates the tags in
+place. Download buttons keep pointing at the WAVs.
+
+With --clip-server, each clip is first tried from clip_server.py, so edits to
+the clip definitions are heard without exporting; browsers fall back to the
+files when the server isn't running.
+"""
+
+import argparse
+import html
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from export_renditions import MANIFEST_FILE, load_manifest
+
+PLAYERS = ["ad_quotes_player.html", "scripts_player.html", "scripts_player_final.html"]
+
+# <audio>, its <source> tags, then any fallback text and </audio>
+AUDIO_TAG = re.compile(r'(<audio[^>]*>)(\s*)((?:<source[^>]*>\s*)+)([^<]*</audio>)')
+SOURCE_SRC = re.compile(r'<source[^>]*\bsrc="([^"]+)"')
+
+
+def audio_sources(wav_file, entry, indent, clip_server=None):
+    """Build the <source> lines for one clip: server, renditions, then the WAV."""
+    sources = []
+    if clip_server:
+        url = f"{clip_server.rstrip('/')}/clip/{quote(Path(wav_file).stem)}"
+        sources.append(f'<source src="{html.escape(url)}" type="audio/wav">')
+    sources += [
+        f'<source src="{html.escape(r["file"])}" type="{html.escape(r["type"])}">'
+        for r in (entry or {}).get("renditions", {}).values()
+    ]
+    sources.append(f'<source src="{html.escape(wav_file)}" type="audio/wav">')
+    return indent.join(sources)
+
+
+def build_player(player_file, manifest, clip_server=None):
+    """
+    Rewrite one player's <audio> sources from the manifest.
+
+    Returns:
+        (clips updated, WAVs not in the manifest)
+    """
+    with open(player_file, 'r') as f:
+        page = f.read()
+
+    clips = manifest["clips"]
+    updated = 0
+    missing = []
+
+    def rewrite(match):
+        nonlocal updated
+        audio_open, indent, sources, tail = match.groups()
+        wav_files = [src for src in SOURCE_SRC.findall(sources) if src.endswith('.wav')]
+        if not wav_files:
+            return match.group(0)
+        if wav_files[0] not in clips:
+            missing.append(wav_files[0])
+            if not clip_server:
+                return match.group(0)
+
+        updated += 1
+        sources = audio_sources(wav_files[0], clips.get(wav_files[0]), indent, clip_server)
+        if tail.startswith('</audio>'):
+            # The closing tag sits one level out from the sources
+            tail = (indent[:-4] if indent.endswith('    ') else indent) + tail
+        else:
+            tail = indent + tail
+        return audio_open + indent + sources + tail
+
+    page = AUDIO_TAG.sub(rewrite, page)
+
+    with open(player_file, 'w') as f:
+        f.write(page)
+
+    return updated, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Update the HTML players to prefer the compressed renditions'
+    )
+    parser.add_argument('players', nargs='*', default=PLAYERS,
+                        help='Player HTML files (default: the three clip players)')
+    parser.add_argument('--manifest', default=MANIFEST_FILE,
+                        help=f'Manifest written by export_renditions.py (default: {MANIFEST_FILE})')
+    parser.add_argument('--clip-server', metavar='URL',
+                        help='Try clips from clip_server.py first (e.g. http://127.0.0.1:8766)')
+
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.manifest)
+    if not manifest["clips"] and not args.clip_server:
+        print(f"✗ No clips in {args.manifest}, run export_renditions.py first")
+        return 1
+
+    for player_file in args.players:
+        updated, missing = build_player(player_file, manifest, args.clip_server)
+        print(f"✓ {player_file}: {updated} clips")
+        for wav_file in missing:
+            print(f"  ⚠️  No renditions exported: {wav_file}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
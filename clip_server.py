@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Local clip server.
+Serves every clip as /clip/<name> straight from memory-mapped PCM of the
+source interviews, with a WAV header and HTTP Range support for scrubbing,
+so nothing has to be exported to hear a clip. The clip definitions (the
+script_*/metadata.json files, CLIP_EXTRACTIONS in extract_full_ad_clips.py
+and the EDL) are re-read whenever they change on disk, so an edited
+timestamp is audible on the next play.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+import numpy as np
+
+from edl import EDL_FILE, apply_gain_fades, load_edl, make_record
+from extract_full_ad_clips import edl_record
+from pcm_cache import open_pcm
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+
+WAV_HEADER_BYTES = 44
+
+# Read for its CLIP_EXTRACTIONS literal (never imported or run)
+EXTRACTIONS_FILE = "extract_full_ad_clips.py"
+
+RANGE_HEADER = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+class ClipCatalog:
+    def __init__(self, base_dir=".", edl_file=EDL_FILE):
+        """
+        Clip records from every definition file, reloaded when any changes.
+
+        Later sources win for the same name: script metadata, the EDL, then
+        CLIP_EXTRACTIONS. A CLIP_EXTRACTIONS range replaces the EDL's but
+        keeps its gain and fades.
+        """
+        self.base_dir = Path(base_dir)
+        self.edl_file = self.base_dir / edl_file
+        self.extractions_file = self.base_dir / EXTRACTIONS_FILE
+        self._signature = None
+        self._clips = {}
+        self._lock = threading.Lock()
+
+    def _definition_files(self):
+        files = sorted(self.base_dir.glob("script_*/metadata.json"))
+        files += [self.edl_file, self.extractions_file]
+        return [f for f in files if f.exists()]
+
+    def _load_extractions(self):
+        """CLIP_EXTRACTIONS from extract_full_ad_clips.py, parsed as a literal."""
+        if not self.extractions_file.exists():
+            return {}
+        tree = ast.parse(self.extractions_file.read_text(), str(self.extractions_file))
+        for node in tree.body:
+            if (isinstance(node, ast.Assign)
+                    and any(isinstance(t, ast.Name) and t.id == "CLIP_EXTRACTIONS" for t in node.targets)):
+                return ast.literal_eval(node.value)
+        return {}
+
+    def _load(self):
+        clips = {}
+
+        for metadata_file in sorted(self.base_dir.glob("script_*/metadata.json")):
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+            for clip in metadata["clips"]:
+                if clip["status"] == "success":
+                    source = clip.get("source_file", metadata["source_file"])
+                    clips[Path(clip["filename"]).stem] = make_record(source, clip["start_ms"], clip["end_ms"])
+
+        if self.edl_file.exists():
+            clips.update(load_edl(self.edl_file)["clips"])
+
+        try:
+            extractions = self._load_extractions()
+        except (SyntaxError, ValueError) as e:
+            # Mid-edit; keep serving the other definitions
+            print(f"⚠️  Could not read CLIP_EXTRACTIONS: {e}")
+            extractions = {}
+        for name, config in extractions.items():
+            record = edl_record(config)
+            if name in clips:
+                record.update({key: clips[name][key] for key in ("gain_db", "fade_in_ms", "fade_out_ms")
+                               if key in clips[name]})
+            clips[name] = record
+
+        return clips
+
+    def clips(self):
+        """Current clip records by name, reloading if a definition changed."""
+        with self._lock:
+            signature = [(str(f), f.stat().st_mtime_ns) for f in self._definition_files()]
+            if signature != self._signature:
+                if self._signature is not None:
+                    print("Clip definitions changed, reloading")
+                self._clips = self._load()
+                self._signature = signature
+            return self._clips
+
+
+def wav_header(data_bytes, sample_rate, channels, sample_width=2):
+    """Canonical 44-byte PCM WAV header."""
+    block_align = channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_bytes, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', data_bytes
+    )
+
+
+class ClipAudio:
+    def __init__(self, record):
+        """A clip as a virtual WAV file over the source's PCM cache."""
+        self.record = record
+        self.pcm = open_pcm(record["source"])
+        self.start_frame = self.pcm.frame_at(record["start_ms"])
+        # A record that ends before it starts is an empty clip
+        self.frame_count = max(0, self.pcm.frame_at(record["end_ms"]) - self.start_frame)
+        self.frame_bytes = self.pcm.channels * self.pcm.sample_width
+        self.size = WAV_HEADER_BYTES + self.frame_count * self.frame_bytes
+
+    def read(self, first, last):
+        """Return bytes first..last (inclusive) of the virtual WAV file."""
+        chunks = []
+        if first < WAV_HEADER_BYTES:
+            header = wav_header(self.frame_count * self.frame_bytes, self.pcm.sample_rate, self.pcm.channels,
+                                self.pcm.sample_width)
+            chunks.append(header[first:last + 1])
+
+        data_first = max(first - WAV_HEADER_BYTES, 0)
+        data_end = last + 1 - WAV_HEADER_BYTES
+        if data_end > data_first:
+            frame_first = data_first // self.frame_bytes
+            frame_end = -(-data_end // self.frame_bytes)
+            samples = self.pcm.samples[self.start_frame + frame_first:self.start_frame + frame_end]
+            samples = apply_gain_fades(samples, frame_first, self.frame_count, self.record, self.pcm.sample_rate)
+            offset = frame_first * self.frame_bytes
+            chunks.append(np.ascontiguousarray(samples).tobytes()[data_first - offset:data_end - offset])
+
+        return b''.join(chunks)
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range Range header.
+
+    Returns:
+        (first, last) inclusive, None for the whole file, or False if the
+        range can't be satisfied
+    """
+    if not header:
+        return None
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first == '':
+        if last == '':
+            return False
+        first = max(0, size - int(last))
+        last = size - 1
+    else:
+        first = int(first)
+        last = min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        return False
+    return first, last
+
+
+def make_handler(catalog):
+    """Build a request handler class bound to a ClipCatalog."""
+
+    class ClipRequestHandler(BaseHTTPRequestHandler):
+        # Set once a response's headers are out; after that an error can
+        # only be logged, not reported
+        headers_sent = False
+
+        def end_headers(self):
+            super().end_headers()
+            self.headers_sent = True
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _serve_clip(self, name, send_body):
+            record = catalog.clips().get(name)
+            if record is None:
+                self._send_json(404, {'error': f"Unknown clip: {name}"})
+                return
+            clip = ClipAudio(record)
+
+            byte_range = parse_range(self.headers.get('Range'), clip.size)
+            if byte_range is False:
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{clip.size}")
+                self.end_headers()
+                return
+
+            first, last = byte_range or (0, clip.size - 1)
+            # Read before any headers go out, so a failure can still be a 500
+            body = clip.read(first, last) if send_body else b''
+
+            self.send_response(206 if byte_range else 200)
+            self.send_header('Content-Type', 'audio/wav')
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('Content-Length', str(last - first + 1))
+            if byte_range:
+                self.send_header('Content-Range', f"bytes {first}-{last}/{clip.size}")
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def _handle(self, send_body):
+            self.headers_sent = False
+            path = unquote(self.path.split('?', 1)[0])
+            try:
+                if path == '/clips':
+                    self._send_json(200, catalog.clips())
+                elif path.startswith('/clip/'):
+                    name = path[len('/clip/'):]
+                    self._serve_clip(name[:-4] if name.endswith('.wav') else name, send_body)
+                else:
+                    self._send_json(404, {'error': f"Unknown endpoint: {path}"})
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+            except Exception as e:
+                if self.headers_sent:
+                    self.log_error("Error after headers were sent for %s: %s", path, e)
+                    self.close_connection = True
+                else:
+                    self._send_json(500, {'error': str(e)})
+
+        def do_GET(self):
+            self._handle(send_body=True)
+
+        def do_HEAD(self):
+            self._handle(send_body=False)
+
+    return ClipRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve clips from the source recordings on localhost')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Host (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--no-preload', action='store_true',
+                        help="Decode each source on its first request instead of at startup")
+
+    args = parser.parse_args()
+
+    catalog = ClipCatalog()
+    clips = catalog.clips()
+    if not args.no_preload:
+        for source in dict.fromkeys(r["source"] for r in clips.values()):
+            if os.path.exists(source):
+                open_pcm(source)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(catalog))
+    print(f"\n✓ Clip server ready on http://{args.host}:{args.port}/clip/<name> ({len(clips)} clips)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
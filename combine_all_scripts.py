@@ -3,9 +3,12 @@
 import os
 os.chdir('/Users/katiemuscarella/Projects/field/ads')
 
-from extract_clips import AudioClipExtractor
-from pydub import AudioSegment
-from pathlib import Path
+from extract_clips import get_extractor
+from concat_audio import concatenate_clips
+
+# Optional crossfade and silence between clips (milliseconds)
+CROSSFADE_MS = 0
+GAP_MS = 0
 
 # Define scripts to combine (from EXTRACTION_SUMMARY.md - complete scripts only)
 scripts_config = {
@@ -61,20 +64,23 @@ for script_name, config in scripts_config.items():
     print(f"Source: {config['source']}")
     print("=" * 60)
 
-    # Load audio and transcribe
-    print(f"Loading audio and transcribing {config['source']}...")
-    extractor = AudioClipExtractor(config['source'], model_size="base")
-    extractor.load_audio()
-    extractor.transcribe()
+    # Scripts from the same source share one extractor, so each file is
+    # decoded and transcribed once and the model is only loaded once
+    extractor = get_extractor(config['source'], model_size="base")
+    if not extractor.audio:
+        print(f"Loading audio and transcribing {config['source']}...")
+        extractor.load_audio()
+    if not extractor.transcription:
+        extractor.transcribe()
 
     print(f"\nFinding {len(config['quotes'])} clips without padding...\n")
 
-    combined = None
-    clips_found = 0
+    ranges = []
+    matches = extractor.find_quotes(config['quotes'])
 
     for i, quote in enumerate(config['quotes'], 1):
         print(f"Clip {i}: {quote[:60]}...")
-        match = extractor.find_quote_timestamps(quote)
+        match = matches[quote]
 
         if match:
             print(f"  ✓ Found at {match['start_time']:.1f}s - {match['end_time']:.1f}s")
@@ -82,30 +88,27 @@ for script_name, config in scripts_config.items():
             # Extract without padding
             start_ms = int(match['start_time'] * 1000)
             end_ms = int(match['end_time'] * 1000)
+            ranges.append((start_ms, end_ms))
 
-            clip = extractor.audio[start_ms:end_ms]
-
-            if combined is None:
-                combined = clip
-            else:
-                combined += clip
-
-            duration = len(clip) / 1000
-            print(f"  Added ({duration:.1f}s)")
-            clips_found += 1
+            print(f"  Added ({(end_ms - start_ms)/1000:.1f}s)")
         else:
             print(f"  ⚠️  Not found")
 
         print()
 
-    # Export combined audio
-    if combined and clips_found > 0:
-        total_duration = len(combined) / 1000
-        print(f"Total: {clips_found}/{len(config['quotes'])} clips, {total_duration:.1f}s ({total_duration/60:.1f} min)")
-
-        output_file = f"{script_name}/{script_name}_complete_clean.wav"
-        print(f"Exporting: {output_file}")
-        combined.export(output_file, format="wav")
+    # Stream the clips straight into the combined file
+    output_file = f"{script_name}/{script_name}_complete_clean.wav"
+    result = concatenate_clips(
+        (extractor.audio[start_ms:end_ms] for start_ms, end_ms in ranges),
+        output_file,
+        crossfade_ms=CROSSFADE_MS,
+        gap_ms=GAP_MS
+    )
+
+    if result:
+        total_duration = result['duration_ms'] / 1000
+        print(f"Total: {len(ranges)}/{len(config['quotes'])} clips, {total_duration:.1f}s ({total_duration/60:.1f} min)")
+        print(f"Exported: {output_file}")
         print(f"✅ Done!\n")
     else:
         print(f"❌ No clips extracted for {script_name}\n")
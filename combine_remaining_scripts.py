@@ -3,6 +3,12 @@
 from pydub import AudioSegment
 from pathlib import Path
 
+from concat_audio import concatenate_clips
+
+# Optional crossfade and silence between clips (milliseconds)
+CROSSFADE_MS = 0
+GAP_MS = 0
+
 # Remaining scripts to process (including partial ones)
 scripts = ["script_1", "script_2", "script_4", "script_5", "script_10"]
 
@@ -31,32 +37,24 @@ for script_name in scripts:
         print(f"  - {f.name}")
     print()
 
-    # Load and combine all clips
-    combined = None
-    total_duration = 0
-
-    for clip_file in clip_files:
-        try:
-            clip = AudioSegment.from_wav(str(clip_file))
-            duration = len(clip) / 1000
-
-            if combined is None:
-                combined = clip
-            else:
-                combined += clip
-
-            total_duration += duration
-            print(f"  ✓ Added {clip_file.name} ({duration:.1f}s)")
-        except Exception as e:
-            print(f"  ✗ Error loading {clip_file.name}: {e}")
-
-    # Export combined audio
-    if combined:
-        output_file = script_dir / f"{script_name}_complete_clean.wav"
+    def load_clips():
+        """Load clips one at a time so only the current clip is in memory."""
+        for clip_file in clip_files:
+            try:
+                clip = AudioSegment.from_wav(str(clip_file))
+                print(f"  ✓ Added {clip_file.name} ({len(clip)/1000:.1f}s)")
+                yield clip
+            except Exception as e:
+                print(f"  ✗ Error loading {clip_file.name}: {e}")
+
+    # Stream all clips into the combined file
+    output_file = script_dir / f"{script_name}_complete_clean.wav"
+    result = concatenate_clips(load_clips(), output_file, crossfade_ms=CROSSFADE_MS, gap_ms=GAP_MS)
+
+    if result:
+        total_duration = result['duration_ms'] / 1000
         print(f"\nTotal duration: {total_duration:.1f}s ({total_duration/60:.1f} min)")
-        print(f"Exporting: {output_file}")
-
-        combined.export(str(output_file), format="wav")
+        print(f"Exported: {output_file}")
         print(f"✅ Done!\n")
     else:
         print(f"❌ No clips were loaded for {script_name}\n")
@@ -3,37 +3,45 @@
 from pydub import AudioSegment
 from pathlib import Path
 
+from concat_audio import concatenate_clips
+
 # Choose Script 6 (6 clips, all from matt 1.m4a, 100% complete)
 script_num = 6
 script_dir = Path(f"script_{script_num}")
 
+# Optional crossfade and silence between clips (milliseconds)
+CROSSFADE_MS = 0
+GAP_MS = 0
+
 print(f"Combining all clips from Script {script_num}...\n")
 
-# Load all clips in order
-clips = []
-clip_files = sorted(script_dir.glob("script_*_clip_*.wav"))
+# Clips in order, skipping any previously combined files
+clip_files = [
+    f for f in sorted(script_dir.glob("script_*_clip_*.wav"))
+    if 'complete' not in f.name
+]
+
 
-for clip_file in clip_files:
-    if 'complete' not in clip_file.name:  # Skip any previously combined files
+def load_clips():
+    """Load clips one at a time so only the current clip is in memory."""
+    for clip_file in clip_files:
         print(f"Loading: {clip_file.name}")
         clip = AudioSegment.from_wav(str(clip_file))
-        clips.append(clip)
         print(f"  Duration: {len(clip)/1000:.1f}s")
+        yield clip
 
-print(f"\nTotal clips: {len(clips)}")
 
-# Combine all clips
-print("\nCombining clips...")
-combined = clips[0]
-for clip in clips[1:]:
-    combined += clip
+print(f"Total clips: {len(clip_files)}")
 
-total_duration = len(combined) / 1000
-print(f"Combined duration: {total_duration:.1f}s ({total_duration/60:.1f} minutes)")
-
-# Export combined audio
+# Combine all clips straight into the output file
 output_file = script_dir / f"script_{script_num}_complete.wav"
-print(f"\nExporting to: {output_file}")
-combined.export(str(output_file), format="wav")
+print(f"\nCombining clips into: {output_file}")
+result = concatenate_clips(load_clips(), output_file, crossfade_ms=CROSSFADE_MS, gap_ms=GAP_MS)
+
+if result:
+    total_duration = result['duration_ms'] / 1000
+    print(f"\nCombined duration: {total_duration:.1f}s ({total_duration/60:.1f} minutes)")
 
-print(f"✅ Done! Created {output_file}")
+    print(f"✅ Done! Created {output_file}")
+else:
+    print(f"❌ No clips were loaded for Script {script_num}")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Linear-time concatenation of clips into a single WAV file.
+Each clip's raw PCM frames are streamed straight into the output file, so the
+combined audio is never re-copied or held in memory.
+"""
+
+import wave
+
+from pydub import AudioSegment
+
+
+def _load_clip(clip):
+    """Return an AudioSegment for a clip given as a segment or a WAV path."""
+    if isinstance(clip, AudioSegment):
+        return clip
+    return AudioSegment.from_wav(str(clip))
+
+
+def _join_value(value, join_index):
+    """Return the setting for one join from an int or a per-join list."""
+    if isinstance(value, (list, tuple)):
+        return value[join_index] if join_index < len(value) else 0
+    return value or 0
+
+
+def _silence(duration_ms, frame_rate, channels, sample_width):
+    """Raw PCM bytes of silence."""
+    frame_count = int(duration_ms * frame_rate / 1000)
+    # 8-bit WAV is unsigned, so its silence is 0x80 rather than 0x00
+    fill = b'\x80' if sample_width == 1 else b'\x00'
+    return fill * (frame_count * channels * sample_width)
+
+
+def concatenate_clips(clips, output_file, crossfade_ms=0, gap_ms=0):
+    """
+    Concatenate clips into one WAV file in a single pass.
+
+    Only the current clip and the short crossfade tail of the previous one are
+    held in memory. Clips are converted to the first clip's sample rate,
+    channel count and sample width if they differ.
+
+    Args:
+        clips: Iterable of AudioSegments or WAV file paths, in order
+        output_file: Path to the combined WAV file
+        crossfade_ms: Crossfade at each join, either one value for all joins
+            or a list with one value per join
+        gap_ms: Silence inserted at each join, either one value for all
+            joins or a list with one value per join. Where a join has both,
+            the clips fade out and in around the gap instead of overlapping.
+
+    Returns:
+        Dictionary with clip_count and duration_ms, or None if there were no
+        clips (in which case no file is written)
+    """
+    out = None
+    held = None  # Tail of the previous clip, kept back for a crossfade
+    clip_count = 0
+    frames_written = 0
+
+    try:
+        for join_index, clip in enumerate(clips):
+            segment = _load_clip(clip)
+
+            if out is None:
+                frame_rate = segment.frame_rate
+                channels = segment.channels
+                sample_width = segment.sample_width
+
+                out = wave.open(str(output_file), 'wb')
+                out.setnchannels(channels)
+                out.setsampwidth(sample_width)
+                out.setframerate(frame_rate)
+            else:
+                segment = (segment.set_frame_rate(frame_rate)
+                                  .set_channels(channels)
+                                  .set_sample_width(sample_width))
+
+            pieces = []
+
+            # Join with the previous clip
+            if held is not None:
+                gap = _join_value(gap_ms, join_index - 1)
+                crossfade = min(_join_value(crossfade_ms, join_index - 1), len(held), len(segment))
+
+                if gap:
+                    if crossfade:
+                        held = held.fade_out(crossfade)
+                        segment = segment.fade_in(crossfade)
+                    pieces.append(held.raw_data)
+                    pieces.append(_silence(gap, frame_rate, channels, sample_width))
+                elif crossfade:
+                    if crossfade < len(held):
+                        pieces.append(held[:-crossfade].raw_data)
+                    pieces.append(held[-crossfade:].append(segment[:crossfade], crossfade=crossfade).raw_data)
+                    segment = segment[crossfade:]
+                else:
+                    pieces.append(held.raw_data)
+
+            # Hold back the tail needed by the next crossfade
+            next_crossfade = _join_value(crossfade_ms, join_index)
+            if next_crossfade and not _join_value(gap_ms, join_index):
+                next_crossfade = min(next_crossfade, len(segment))
+                pieces.append(segment[:-next_crossfade].raw_data if next_crossfade < len(segment) else b'')
+                held = segment[-next_crossfade:]
+            else:
+                held = segment
+
+            for data in pieces:
+                out.writeframesraw(data)
+                frames_written += len(data) // (channels * sample_width)
+
+            clip_count += 1
+
+        if out is None:
+            return None
+
+        out.writeframesraw(held.raw_data)
+        frames_written += len(held.raw_data) // (channels * sample_width)
+    finally:
+        if out is not None:
+            out.close()
+
+    return {
+        'clip_count': clip_count,
+        'duration_ms': frames_written * 1000 / frame_rate
+    }
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Edit decision list (EDL) of clips.
+A clip is a record of (source, start_ms, end_ms, gain_db, fade_in_ms,
+fade_out_ms) in clips_edl.json instead of its own WAV copy. Records are
+rendered on demand into .render_cache/, keyed by a hash of the record and the
+source's contents, so clip names that share a range share one render and
+nothing is re-cut until its record or source changes. Exporting hard-links
+the renders into place under the clip names.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+from audio_cache import load_audio, load_audio_range
+from peaks import peaks_path, segment_samples, write_peaks
+from transcript_cache import file_sha256
+
+EDL_FILE = "clips_edl.json"
+RENDER_CACHE_DIR = ".render_cache"
+
+# Sources with at least this many renders to do are decoded whole into the
+# PCM cache; fewer are cut by seeking (or from the PCM cache if it has them)
+FULL_DECODE_MIN_CLIPS = 3
+
+# (absolute path, mtime_ns) -> sha256
+_SOURCE_HASHES = {}
+
+
+def load_edl(edl_file=EDL_FILE):
+    """Load the EDL, or an empty one."""
+    if not Path(edl_file).exists():
+        return {"clips": {}}
+    with open(edl_file, 'r') as f:
+        return json.load(f)
+
+
+def save_edl(edl, edl_file=EDL_FILE):
+    tmp_path = f"{edl_file}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(edl, f, indent=2)
+    os.replace(tmp_path, edl_file)
+
+
+def make_record(source, start_ms, end_ms, gain_db=0, fade_in_ms=0, fade_out_ms=0):
+    """Build an EDL record for a range of a source recording."""
+    return {
+        "source": str(source),
+        "start_ms": int(max(0, start_ms)),
+        "end_ms": int(end_ms),
+        "gain_db": gain_db,
+        "fade_in_ms": fade_in_ms,
+        "fade_out_ms": fade_out_ms
+    }
+
+
+def source_hash(source):
+    """Content hash of a source file, re-hashed only when it changes."""
+    path = os.path.abspath(source)
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in _SOURCE_HASHES:
+        _SOURCE_HASHES[key] = file_sha256(path)
+    return _SOURCE_HASHES[key]
+
+
+def record_key(record):
+    """Render cache key: everything that affects the rendered audio."""
+    key_data = dict(record, source=source_hash(record["source"]))
+    encoded = json.dumps(key_data, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def render_path(record, cache_dir=RENDER_CACHE_DIR):
+    return Path(cache_dir) / f"{record_key(record)}.wav"
+
+
+def apply_gain_fades(samples, first_frame, total_frames, record, sample_rate):
+    """
+    Apply a record's gain and linear fades to frames [first_frame, ...) of a clip.
+
+    Shared by the renders and clip_server.py, so a clip sounds the same
+    exported or served.
+
+    Args:
+        samples: (frames, channels) integer slice of the clip
+        first_frame: Position of the slice within the clip
+        total_frames: Length of the whole clip in frames
+        sample_rate: Frames per second
+
+    Returns:
+        The processed samples (the input array if the record changes nothing)
+    """
+    gain_db = record.get("gain_db") or 0
+    fade_in = int((record.get("fade_in_ms") or 0) * sample_rate / 1000)
+    fade_out = int((record.get("fade_out_ms") or 0) * sample_rate / 1000)
+    if not (gain_db or fade_in or fade_out):
+        return samples
+
+    positions = np.arange(first_frame, first_frame + len(samples))
+    scale = np.full(len(samples), 10 ** (gain_db / 20))
+    if fade_in:
+        scale *= np.clip(positions / fade_in, 0, 1)
+    if fade_out:
+        scale *= np.clip((total_frames - positions) / fade_out, 0, 1)
+
+    limits = np.iinfo(samples.dtype)
+    scaled = samples.astype(np.float32) * scale[:, None].astype(np.float32)
+    return np.clip(np.round(scaled), limits.min, limits.max).astype(samples.dtype)
+
+
+def apply_record(audio, record):
+    """Apply a record's gain and fades to its cut audio."""
+    samples = segment_samples(audio)
+    processed = apply_gain_fades(samples, 0, len(samples), record, audio.frame_rate)
+    if processed is samples:
+        return audio
+    return audio._spawn(processed.tobytes())
+
+
+def _render(source, path, record, audio=None):
+    """Cut, process and save one record to its render path."""
+    if audio is None:
+        clip = load_audio_range(source, record["start_ms"], record["end_ms"])
+    else:
+        clip = audio[record["start_ms"]:min(len(audio), record["end_ms"])]
+    clip = apply_record(clip, record)
+
+    # The peaks go first: a render in the cache always has its peak file
+    write_peaks(clip, path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    clip.export(tmp_path, format="wav")
+    os.replace(tmp_path, path)
+    print(f"  ✓ Rendered {source} [{record['start_ms']/1000:.2f}s - {record['end_ms']/1000:.2f}s]")
+
+
+def render_records(records, cache_dir=RENDER_CACHE_DIR, workers=1, seek=None):
+    """
+    Render records that are not in the render cache yet.
+
+    Each unique record is rendered once, however many clip names use it.
+
+    Args:
+        records: Iterable of EDL records
+        workers: Threads used to render the clips of one source
+        seek: True to always decode just each clip's range, False to always
+            decode whole sources, None to decide per source
+
+    Returns:
+        Number of records rendered (cache misses)
+    """
+    Path(cache_dir).mkdir(exist_ok=True)
+
+    pending = {}
+    for record in records:
+        path = render_path(record, cache_dir)
+        if not path.exists():
+            pending.setdefault(record["source"], {})[path] = record
+
+    rendered = 0
+    for source, source_records in pending.items():
+        if seek is None:
+            full_decode = len(source_records) >= FULL_DECODE_MIN_CLIPS
+        else:
+            full_decode = not seek
+        audio = load_audio(source) if full_decode else None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_render, source, path, record, audio): path
+                for path, record in source_records.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    rendered += 1
+                except Exception as e:
+                    print(f"  ✗ Error ({source}): {e}")
+
+    return rendered
+
+
+def render_clip(name, edl=None, cache_dir=RENDER_CACHE_DIR):
+    """
+    Return the rendered WAV for a clip name, rendering it if needed.
+
+    Args:
+        name: Clip name in the EDL
+        edl: Loaded EDL (default: read clips_edl.json)
+
+    Returns:
+        Path to the cached render
+    """
+    edl = edl or load_edl()
+    if name not in edl["clips"]:
+        raise KeyError(f"Unknown clip: {name}")
+    record = edl["clips"][name]
+    render_records([record], cache_dir)
+    return render_path(record, cache_dir)
+
+
+def _link(src, dest):
+    """Hard-link src to dest (copying across filesystems)."""
+    dest = Path(dest)
+    # Already linked (rename() would leave the temp link behind)
+    if dest.exists() and os.path.samefile(src, dest):
+        return
+    tmp_path = dest.with_name(f".{dest.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+def export_clips(names=None, output_dir="ad_clips", edl=None, cache_dir=RENDER_CACHE_DIR,
+                 workers=1, seek=None):
+    """
+    Export clips as named WAVs (with peaks) from the render cache.
+
+    Args:
+        names: Clip names to export (default: every clip in the EDL)
+        output_dir: Where to put <name>.wav
+        workers, seek: As for render_records()
+
+    Returns:
+        List of exported file paths
+    """
+    edl = edl or load_edl()
+    names = names or list(edl["clips"])
+    records = [edl["clips"][name] for name in names]
+
+    unique = {record_key(r): r for r in records}
+    print(f"Exporting {len(names)} clips ({len(unique)} unique ranges)...")
+    rendered = render_records(unique.values(), cache_dir, workers, seek)
+    print(f"Rendered {rendered}, reused {len(unique) - rendered} from {cache_dir}/")
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    exported = []
+    for name, record in zip(names, records):
+        render = render_path(record, cache_dir)
+        if not render.exists():
+            print(f"  ✗ Not rendered: {name}")
+            continue
+        output_file = Path(output_dir) / f"{name}.wav"
+        _link(render, output_file)
+        if not peaks_path(render).exists():
+            # Rendered before peaks were written first (or the file was lost)
+            write_peaks(AudioSegment.from_wav(render), render)
+        _link(peaks_path(render), peaks_path(output_file))
+        exported.append(str(output_file))
+
+    return exported
+
+
+def prune_renders(edl=None, cache_dir=RENDER_CACHE_DIR):
+    """Delete cached renders that no EDL record uses any more."""
+    edl = edl or load_edl()
+    used = {f"{record_key(r)}.wav" for r in edl["clips"].values()}
+    removed = 0
+    for path in Path(cache_dir).glob("*.wav"):
+        if path.name not in used:
+            path.unlink()
+            peaks_path(path).unlink(missing_ok=True)
+            removed += 1
+    # Peaks left behind by a render that failed after writing them
+    for path in Path(cache_dir).glob("*.peaks"):
+        if not path.with_suffix(".wav").exists():
+            path.unlink()
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render and export clips from the EDL')
+    parser.add_argument('--edl', default=EDL_FILE,
+                        help=f'EDL file (default: {EDL_FILE})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List the clips in the EDL')
+
+    export_parser = subparsers.add_parser('export', help='Export clips as WAVs')
+    export_parser.add_argument('names', nargs='*', help='Clip names (default: all)')
+    export_parser.add_argument('--output-dir', default='ad_clips',
+                               help='Output directory (default: ad_clips)')
+
+    subparsers.add_parser('prune', help='Delete renders no clip uses any more')
+
+    args = parser.parse_args()
+    edl = load_edl(args.edl)
+
+    if args.command == 'list':
+        for name, record in edl["clips"].items():
+            print(f"{name}: {record['source']} [{record['start_ms']/1000:.2f}s - "
+                  f"{record['end_ms']/1000:.2f}s]")
+        print(f"\n{len(edl['clips'])} clips")
+
+    elif args.command == 'export':
+        unknown = [name for name in args.names if name not in edl["clips"]]
+        if unknown:
+            print(f"✗ Unknown clip(s): {', '.join(unknown)}")
+            return 1
+        exported = export_clips(args.names, args.output_dir, edl)
+        print(f"\n✓ Exported {len(exported)} clips to {args.output_dir}/")
+
+    elif args.command == 'prune':
+        print(f"✓ Removed {prune_renders(edl)} unused renders")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
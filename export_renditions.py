@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Export compressed renditions of the clip WAVs for the HTML players.
+Each WAV gets an Opus (.opus) and an AAC (.m4a) copy next to it, and
+renditions.json records every clip's duration, size and hash along with its
+renditions. The WAVs stay the masters; clips whose WAV hash is unchanged
+since the last export are skipped.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from pydub.utils import get_encoder_name
+
+from transcript_cache import file_sha256
+
+MANIFEST_FILE = "renditions.json"
+
+# Folders exported by default
+CLIP_DIRS = ["ad_clips", "script_*"]
+
+# Speech-tuned encodings: (extension, MIME type for <source>, ffmpeg args)
+RENDITIONS = {
+    "opus": (".opus", "audio/ogg; codecs=opus", ['-c:a', 'libopus', '-b:a', '48k', '-application', 'voip']),
+    "aac": (".m4a", "audio/mp4", ['-c:a', 'aac', '-b:a', '64k', '-movflags', '+faststart'])
+}
+
+
+def find_clip_files(patterns=CLIP_DIRS):
+    """Return the WAV files in the given folders (glob patterns allowed)."""
+    files = []
+    for pattern in patterns:
+        for folder in sorted(Path('.').glob(pattern)):
+            files.extend(sorted(str(f) for f in folder.glob("*.wav")))
+    return files
+
+
+def load_manifest(manifest_path=MANIFEST_FILE):
+    """Load the renditions manifest, or an empty one."""
+    if not Path(manifest_path).exists():
+        return {"clips": {}}
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_path=MANIFEST_FILE):
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def wav_info(wav_file):
+    """Read duration and format from a WAV header without decoding it."""
+    with wave.open(str(wav_file), 'rb') as w:
+        return {
+            "duration_ms": int(w.getnframes() * 1000 / w.getframerate()),
+            "sample_rate": w.getframerate(),
+            "channels": w.getnchannels()
+        }
+
+
+def encode(wav_file, output_file, args):
+    """Encode a WAV with ffmpeg, writing through a temp file."""
+    tmp_file = Path(output_file).with_name(f".{Path(output_file).name}.tmp")
+    command = [
+        get_encoder_name(), '-v', 'error', '-y',
+        '-i', str(wav_file),
+        '-vn', *args,
+        '-f', 'ogg' if str(output_file).endswith('.opus') else 'mp4',
+        str(tmp_file)
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        tmp_file.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg failed to encode {wav_file}: {result.stderr.decode(errors='replace')}")
+    os.replace(tmp_file, output_file)
+
+
+def export_clip(wav_file, previous=None, force=False):
+    """
+    Write every rendition of one WAV.
+
+    Args:
+        wav_file: Path to the master WAV
+        previous: This clip's manifest entry from the last export, if any
+        force: Re-encode even if the WAV is unchanged
+
+    Returns:
+        (manifest entry, True if anything was encoded)
+    """
+    sha256 = file_sha256(wav_file)
+    entry = dict(wav_info(wav_file), size=os.path.getsize(wav_file), sha256=sha256, renditions={})
+    encoded = False
+
+    for name, (suffix, mime_type, args) in RENDITIONS.items():
+        output_file = str(Path(wav_file).with_suffix(suffix))
+        old = (previous or {}).get("renditions", {}).get(name)
+        unchanged = (
+            not force and previous and previous["sha256"] == sha256
+            and old and Path(output_file).exists()
+            and os.path.getsize(output_file) == old["size"]
+        )
+        if not unchanged:
+            encode(wav_file, output_file, args)
+            encoded = True
+
+        entry["renditions"][name] = {
+            "file": output_file,
+            "type": mime_type,
+            "size": os.path.getsize(output_file),
+            "sha256": old["sha256"] if unchanged else file_sha256(output_file)
+        }
+
+    return entry, encoded
+
+
+def export_renditions(wav_files, manifest_path=MANIFEST_FILE, workers=4, force=False):
+    """
+    Export renditions for a set of WAVs and update the manifest.
+
+    Returns:
+        The updated manifest
+    """
+    manifest = load_manifest(manifest_path)
+    clips = manifest["clips"]
+    encoded = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(export_clip, wav_file, clips.get(wav_file), force): wav_file
+            for wav_file in wav_files
+        }
+        for future in as_completed(futures):
+            wav_file = futures[future]
+            try:
+                entry, changed = future.result()
+            except Exception as e:
+                print(f"  ✗ Error ({wav_file}): {e}")
+                continue
+
+            clips[wav_file] = entry
+            if changed:
+                encoded += 1
+                sizes = ", ".join(f"{name} {r['size']/1024:.0f}KB" for name, r in entry["renditions"].items())
+                print(f"  ✓ {wav_file} ({entry['size']/1024:.0f}KB WAV -> {sizes})")
+
+    # Forget clips whose WAV is gone
+    for wav_file in [f for f in clips if not Path(f).exists()]:
+        del clips[wav_file]
+
+    manifest["clips"] = dict(sorted(clips.items()))
+    save_manifest(manifest, manifest_path)
+    print(f"\nEncoded {encoded}, unchanged {len(wav_files) - encoded}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export Opus/AAC renditions of clip WAVs and write the players manifest'
+    )
+    parser.add_argument('files', nargs='*',
+                        help='WAV files to export (default: ad_clips/ and script_*/)')
+    parser.add_argument('--manifest', default=MANIFEST_FILE,
+                        help=f'Manifest file (default: {MANIFEST_FILE})')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Encoder processes to run at once (default: 4)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-encode clips even if their WAV is unchanged')
+
+    args = parser.parse_args()
+
+    wav_files = args.files or find_clip_files()
+    if not wav_files:
+        print("✗ No WAV files found")
+        return 1
+
+    print(f"Exporting renditions for {len(wav_files)} clips...\n")
+    manifest = export_renditions(wav_files, args.manifest, args.workers, args.force)
+
+    clips = manifest["clips"].values()
+    wav_total = sum(c["size"] for c in clips)
+    for name in RENDITIONS:
+        total = sum(c["renditions"][name]["size"] for c in clips if name in c["renditions"])
+        if total:
+            print(f"  {name}: {total/1024/1024:.1f}MB ({wav_total/total:.0f}x smaller than WAV)")
+
+    print(f"\n✓ Manifest saved to {args.manifest}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
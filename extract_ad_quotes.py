@@ -4,13 +4,20 @@ Extract ad quote audio clips from interview recordings.
 Searches for 26 specific quotes across all audio files and extracts them.
 """
 
-import whisper
 import json
 from pathlib import Path
-from pydub import AudioSegment
-from fuzzywuzzy import fuzz
 import argparse
 
+from audio_cache import load_audio
+from boundary_snap import snap_boundaries
+from extract_clips import get_model
+from fireflies import find_fireflies_export, load_fireflies_transcript
+from transcript_cache import cached_transcribe, transcribe_options
+from transcript_index import TranscriptIndex
+from parallel_transcribe import transcribe_parallel
+from peaks import write_peaks
+from vad import transcribe_with_vad
+
 # All 26 ad quote candidates with their expected text
 AD_QUOTES = {
     "heirloom_forever": "Not just because it's non toxic, not because it's non stick. But even if you bought all those, you know, in another type of pan with a coating, I don't think you'd be bringing it on adventures, bringing it to your friend's house. There's something really meaningful that it's an heirloom and it'll be with you forever. And I think that kind of starts to make you think about not consuming as much and buying things very intentionally that you think will also have that type of journey in your life.",
@@ -64,45 +71,66 @@ AD_QUOTES = {
     "hold_it_feel_it": "Once you interact with this skillet, you're like. This is like. Like seeing. Once you hold it, once you feel it, like, if those. The way you have that set up in that room, it's like, literally, you could just hang it on the wall if that's all you want to do with it.",
 }
 
-def find_quote_in_segments(quote_text, segments, threshold=70):
-    """Find the best matching segment for a quote using fuzzy matching."""
-    best_match = None
-    best_score = 0
-    best_start = None
-    best_end = None
-
-    # Try different window sizes to find the quote
-    for window_size in range(1, min(len(segments) + 1, 20)):
-        for i in range(len(segments) - window_size + 1):
-            window_segments = segments[i:i + window_size]
-            window_text = " ".join([s["text"] for s in window_segments])
-
-            score = fuzz.ratio(quote_text.lower(), window_text.lower())
-
-            if score > best_score:
-                best_score = score
-                best_match = window_text
-                best_start = window_segments[0]["start"]
-                best_end = window_segments[-1]["end"]
-
-    if best_score >= threshold:
-        return {
-            "matched_text": best_match,
-            "score": best_score,
-            "start": best_start,
-            "end": best_end
+
+def find_quote_in_segments(quote_text, segments, threshold=70, speaker=None):
+    """
+    Find the best match for a quote, aligned word by word (see
+    find_quotes_in_segments()).
+    """
+    return find_quotes_in_segments({"quote": quote_text}, segments, threshold, speaker)["quote"]
+
+
+def find_quotes_in_segments(quotes, segments, threshold=70, speaker=None):
+    """
+    Find many quotes in the same segments in one batch.
+
+    The segments' words are indexed once and every quote is aligned with
+    TranscriptIndex.find_many(), which seeds all the quotes' candidate
+    regions in one lookup and scores each alignment with fuzz.ratio. With a
+    speaker, other speakers' turns are skipped (transcripts without speaker
+    labels are searched in full).
+
+    Args:
+        quotes: Dictionary of name -> quote text
+        segments: Transcript segments with word timestamps
+        threshold: Minimum similarity score (0-100)
+        speaker: Only search this speaker's segments
+
+    Returns:
+        Dictionary of name -> match (matched_text, score, start, end) or None
+    """
+    index = TranscriptIndex({"segments": segments}, speaker=speaker)
+    matches = index.find_many(quotes.values(), threshold)
+
+    results = {}
+    for name, quote_text in quotes.items():
+        match = matches[quote_text]
+        results[name] = match and {
+            "matched_text": match["matched_text"],
+            "score": match["score"],
+            "start": match["start_time"],
+            "end": match["end_time"]
         }
+    return results
 
-    return None
 
-def extract_ad_quotes(audio_files, output_dir="ad_clips", model_size="base", padding_ms=500):
+def extract_ad_quotes(audio_files, output_dir="ad_clips", model_size="base", padding_ms=500,
+                      use_cache=True, refresh_cache=False, transcript_source="whisper", speaker=None,
+                      snap=False, vad=False, workers=1):
     """Extract all ad quote clips from audio files."""
 
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
 
-    print(f"Loading Whisper model '{model_size}'...")
-    model = whisper.load_model(model_size)
+    # The model is only loaded if some file is missing from the transcript cache
+    def run_whisper(audio_file):
+        if workers > 1 and not vad:
+            return transcribe_parallel(audio_file, model_size, workers=workers, word_timestamps=True)
+        model = get_model(model_size)
+        print("Transcribing audio...")
+        if vad:
+            return transcribe_with_vad(model, audio_file, word_timestamps=True)
+        return model.transcribe(str(audio_file), word_timestamps=True)
 
     results = {}
 
@@ -111,31 +139,52 @@ def extract_ad_quotes(audio_files, output_dir="ad_clips", model_size="base", pad
         print(f"Processing: {audio_file}")
         print(f"{'='*60}\n")
 
-        # Transcribe
-        print("Transcribing audio...")
-        result = model.transcribe(str(audio_file), word_timestamps=True)
+        # Transcribe (or load the Fireflies export)
+        export = find_fireflies_export(audio_file) if transcript_source != "whisper" else None
+        if export:
+            print(f"Loading Fireflies transcript: {export}")
+            result = load_fireflies_transcript(export)
+        elif transcript_source == "fireflies":
+            print(f"✗ No Fireflies export for {audio_file}, skipping")
+            continue
+        else:
+            result = cached_transcribe(
+                str(audio_file),
+                model_size,
+                lambda: run_whisper(audio_file),
+                options=transcribe_options(vad, workers),
+                use_cache=use_cache,
+                refresh=refresh_cache
+            )
         segments = result["segments"]
 
-        # Try to find each quote
-        for clip_name, quote_text in AD_QUOTES.items():
-            # Skip if already found
-            if clip_name in results:
-                continue
+        # Match every quote not found yet in one batch
+        remaining = {name: quote for name, quote in AD_QUOTES.items() if name not in results}
+        matches = find_quotes_in_segments(remaining, segments, speaker=speaker)
 
+        # Try to find each quote
+        for clip_name in remaining:
             print(f"\nSearching for: {clip_name}...")
-            match = find_quote_in_segments(quote_text, segments)
+            match = matches[clip_name]
 
             if match:
                 print(f"✓ Found! (score: {match['score']}%)")
 
-                # Extract audio
-                audio = AudioSegment.from_file(audio_file)
-                start_ms = max(0, match['start'] * 1000 - padding_ms)
-                end_ms = min(len(audio), match['end'] * 1000 + padding_ms)
+                # Extract audio (decoded once per file)
+                audio = load_audio(audio_file)
+                if snap:
+                    start_ms, end_ms = snap_boundaries(
+                        audio_file, int(match['start'] * 1000), int(match['end'] * 1000),
+                        radius_ms=padding_ms, audio=audio
+                    )
+                else:
+                    start_ms = max(0, match['start'] * 1000 - padding_ms)
+                    end_ms = min(len(audio), match['end'] * 1000 + padding_ms)
 
                 clip = audio[start_ms:end_ms]
                 output_file = output_path / f"{clip_name}.wav"
                 clip.export(output_file, format="wav")
+                write_peaks(clip, output_file)
 
                 results[clip_name] = {
                     "source_file": str(audio_file),
@@ -171,17 +220,35 @@ def extract_ad_quotes(audio_files, output_dir="ad_clips", model_size="base", pad
 
     return results
 
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract ad quote clips from audio")
     parser.add_argument("--model", default="base", choices=["tiny", "base", "small", "medium", "large"],
                        help="Whisper model size (default: base)")
     parser.add_argument("--padding", type=int, default=500,
                        help="Padding in milliseconds (default: 500)")
+    parser.add_argument("--snap", action="store_true",
+                       help="Cut at the nearest quiet gap within the padding instead of a fixed padding")
     parser.add_argument("--output-dir", default="ad_clips",
                        help="Output directory (default: ad_clips)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Do not read or write the transcript cache")
+    parser.add_argument("--refresh", action="store_true",
+                       help="Re-transcribe and overwrite cached transcriptions")
+    parser.add_argument("--vad", action="store_true",
+                       help="Skip silence before transcribing (faster on CPU)")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Transcribe each file in chunks across this many processes (default: 1)")
+    parser.add_argument("--transcript", default="whisper", choices=["whisper", "fireflies", "auto"],
+                       help="Transcript source; auto uses a Fireflies export when one exists")
+    parser.add_argument("--speaker",
+                       help="Only match quotes spoken by this speaker, e.g. matt (Fireflies transcripts)")
 
     args = parser.parse_args()
 
+    if args.vad and args.workers > 1:
+        print("⚠️  --workers is ignored with --vad (the speech is transcribed in one process)")
+
     # Find all audio files
     audio_files = list(Path("audio").glob("*.m4a"))
 
@@ -196,5 +263,12 @@ if __name__ == "__main__":
         audio_files,
         output_dir=args.output_dir,
         model_size=args.model,
-        padding_ms=args.padding
+        padding_ms=args.padding,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh,
+        transcript_source=args.transcript,
+        speaker=args.speaker,
+        snap=args.snap,
+        vad=args.vad,
+        workers=args.workers
     )
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Extract all scripts from all audio files in a single process.
+Each recording is transcribed once, every quote is matched against all
+transcripts, and each clip is cut from its best-scoring source.
+"""
+
+import argparse
+from collections import Counter
+from pathlib import Path
+
+from extract_clips import SCRIPTS, get_extractor, save_script_files
+
+
+def load_extractors(audio_files, model_size="base", use_cache=True, refresh_cache=False,
+                    transcript_source="whisper", refine_words=False, speaker=None, vad=False,
+                    workers=1):
+    """Create one transcribed extractor per audio file; they share one Whisper model."""
+    extractors = []
+
+    for audio_file in audio_files:
+        print(f"\n{'='*60}")
+        print(f"Transcribing: {audio_file}")
+        print(f"{'='*60}")
+
+        extractor = get_extractor(
+            audio_file,
+            model_size=model_size,
+            use_cache=use_cache,
+            refresh_cache=refresh_cache,
+            transcript_source=transcript_source,
+            refine_words=refine_words,
+            speaker=speaker,
+            vad=vad,
+            workers=workers
+        )
+        if not extractor.transcription:
+            extractor.transcribe()
+
+        extractors.append(extractor)
+
+    return extractors
+
+
+def find_best_matches(extractors, quotes):
+    """
+    Match quotes against every transcript and keep each quote's highest score.
+
+    Each transcript is searched once for the whole batch of quotes.
+
+    Returns:
+        Dictionary mapping each quote to an (extractor, match) tuple, or
+        (None, None) if no transcript matches it
+    """
+    best = {quote: (None, None) for quote in quotes}
+
+    for extractor in extractors:
+        for quote, match in extractor.find_quotes(list(best)).items():
+            best_match = best[quote][1]
+            if match and (best_match is None or match['score'] > best_match['score']):
+                best[quote] = (extractor, match)
+
+    return best
+
+
+def process_script(extractors, script_name, quotes, output_dir, padding_ms=500, matches=None,
+                   snap=False):
+    """
+    Extract one script, taking each clip from its best-matching recording.
+
+    Args:
+        snap: Snap clip boundaries to quiet gaps within padding_ms
+        matches: Result of find_best_matches() covering these quotes;
+            computed here if not given
+
+    Returns:
+        Dictionary with metadata about all extracted clips
+    """
+    script_dir = Path(output_dir) / script_name
+    script_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"\nProcessing {script_name}...")
+    print(f"Extracting {len(quotes)} clips...\n")
+
+    if matches is None:
+        matches = find_best_matches(extractors, quotes)
+
+    clips = []
+
+    for idx, quote in enumerate(quotes, 1):
+        print(f"Clip {idx}/{len(quotes)}: {quote[:50]}...")
+
+        extractor, match = matches[quote]
+
+        if not match:
+            print(f"  ⚠️  WARNING: Could not find quote in any transcription")
+            clips.append({
+                'clip_number': idx,
+                'quote': quote,
+                'status': 'not_found'
+            })
+            continue
+
+        print(f"  ✓ Found match in {extractor.audio_file} (score: {match['score']}%)")
+        print(f"    Matched: {match['matched_text'][:60]}...")
+
+        clip_filename = f"{script_name}_clip_{idx:02d}.wav"
+        clip_path = script_dir / clip_filename
+
+        clip_info = extractor.extract_clip(
+            match['start_time'],
+            match['end_time'],
+            str(clip_path),
+            padding_ms,
+            snap=snap
+        )
+
+        print(f"    Saved: {clip_filename}")
+        print(f"    Duration: {clip_info['duration_ms']/1000:.1f}s\n")
+
+        clips.append({
+            'clip_number': idx,
+            'filename': clip_filename,
+            'quote': quote,
+            'source_file': extractor.audio_file,
+            'matched_text': match['matched_text'],
+            'match_score': match['score'],
+            'start_time_seconds': match['start_time'],
+            'end_time_seconds': match['end_time'],
+            'start_ms': clip_info['start_ms'],
+            'end_ms': clip_info['end_ms'],
+            'duration_ms': clip_info['duration_ms'],
+            'padding_ms': padding_ms,
+            'snapped': snap,
+            'status': 'success'
+        })
+
+    # The script-level source is the recording most clips came from
+    sources = Counter(c['source_file'] for c in clips if c['status'] == 'success')
+    source_file = sources.most_common(1)[0][0] if sources else extractors[0].audio_file
+
+    metadata = {
+        'script_name': script_name,
+        'source_file': source_file,
+        'clips': clips
+    }
+
+    save_script_files(script_dir, script_name, quotes, metadata)
+
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Extract all scripts from all audio files in one pass'
+    )
+    parser.add_argument(
+        'audio_files',
+        nargs='*',
+        help='Audio files to search (default: all .m4a files in audio/)'
+    )
+    parser.add_argument(
+        '--scripts',
+        nargs='+',
+        default=list(SCRIPTS.keys()),
+        help='Scripts to extract (default: all)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='.',
+        help='Output directory (default: current directory)'
+    )
+    parser.add_argument(
+        '--padding',
+        type=int,
+        default=500,
+        help='Padding in milliseconds (default: 500)'
+    )
+    parser.add_argument(
+        '--snap',
+        action='store_true',
+        help='Cut at the nearest quiet gap within the padding instead of a fixed padding'
+    )
+    parser.add_argument(
+        '--model',
+        default='base',
+        choices=['tiny', 'base', 'small', 'medium', 'large'],
+        help='Whisper model size (default: base)'
+    )
+    parser.add_argument(
+        '--transcript',
+        default='whisper',
+        choices=['whisper', 'fireflies', 'auto'],
+        help='Transcript source; auto uses a Fireflies export when one exists (default: whisper)'
+    )
+    parser.add_argument(
+        '--refine',
+        action='store_true',
+        help='With a Fireflies transcript, refine word boundaries with Whisper'
+    )
+    parser.add_argument(
+        '--speaker',
+        help='Only match quotes spoken by this speaker, e.g. matt (Fireflies transcripts)'
+    )
+    parser.add_argument(
+        '--vad',
+        action='store_true',
+        help='Skip silence before transcribing (faster on CPU)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Transcribe each file in chunks across this many processes (default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the transcript cache'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-transcribe and overwrite cached transcriptions'
+    )
+
+    args = parser.parse_args()
+
+    if args.vad and args.workers > 1:
+        print("⚠️  --workers is ignored with --vad (the speech is transcribed in one process)")
+
+    unknown = [name for name in args.scripts if name not in SCRIPTS]
+    if unknown:
+        print(f"Error: Script(s) not defined: {', '.join(unknown)}")
+        print(f"Available scripts: {', '.join(SCRIPTS.keys())}")
+        return 1
+
+    audio_files = args.audio_files or sorted(str(p) for p in Path("audio").glob("*.m4a"))
+    if not audio_files:
+        print("Error: No audio files found in audio/ directory")
+        return 1
+
+    print(f"Processing {len(args.scripts)} scripts across {len(audio_files)} audio files...")
+
+    extractors = load_extractors(
+        audio_files,
+        model_size=args.model,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh,
+        transcript_source=args.transcript,
+        refine_words=args.refine,
+        speaker=args.speaker,
+        vad=args.vad,
+        workers=args.workers
+    )
+
+    # Match every quote of every script in one batch per transcript
+    print(f"\nMatching quotes...")
+    matches = find_best_matches(
+        extractors,
+        [quote for script_name in args.scripts for quote in SCRIPTS[script_name]]
+    )
+
+    for script_name in args.scripts:
+        process_script(
+            extractors,
+            script_name,
+            SCRIPTS[script_name],
+            args.output_dir,
+            padding_ms=args.padding,
+            matches=matches,
+            snap=args.snap
+        )
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
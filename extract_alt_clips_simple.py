@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 """Extract alternative clips using known timestamps"""
-from pydub import AudioSegment
 from pathlib import Path
 
-# Load the audio file
-print("Loading audio file...")
-audio = AudioSegment.from_file("audio/matt 1.m4a", format="m4a")
-print(f"Audio loaded: {len(audio)/1000:.1f} seconds\n")
+from audio_cache import load_audio_range
+from peaks import write_peaks
+
+# Only the clip ranges are decoded, not the whole file
+audio_file = "audio/matt 1.m4a"
 
 # Define clips with their timestamps (in seconds)
 clips = [
@@ -41,10 +41,10 @@ for clip_info in clips:
 
     # Convert to milliseconds and add padding
     start_ms = max(0, int(clip_info['start'] * 1000) - padding_ms)
-    end_ms = min(len(audio), int(clip_info['end'] * 1000) + padding_ms)
+    end_ms = int(clip_info['end'] * 1000) + padding_ms
 
-    # Extract the clip
-    clip = audio[start_ms:end_ms]
+    # Seek and decode just this clip (stops early at the end of the file)
+    clip = load_audio_range(audio_file, start_ms, end_ms)
 
     # Ensure directory exists
     output_path = Path(clip_info['filename'])
@@ -52,8 +52,9 @@ for clip_info in clips:
 
     # Export as WAV
     clip.export(str(output_path), format="wav")
+    write_peaks(clip, output_path)
 
-    duration = (end_ms - start_ms) / 1000
+    duration = len(clip) / 1000
     print(f"  Saved: {clip_info['filename']} ({duration:.1f}s)\n")
 
 print("Done! 3 alternative clips extracted.")
@@ -2,11 +2,14 @@
 """
 Extract full ad quote clips using Fireflies JSON timestamps.
 Ensures each clip contains the complete text shown in the player.
+Clips are recorded in the EDL (edl.py) and rendered through its cache, so
+unchanged clips are not re-cut and clips sharing a range share one render.
 """
 
-import json
+import argparse
 from pathlib import Path
-from pydub import AudioSegment
+
+from edl import export_clips, load_edl, make_record, save_edl
 
 # Map of ad quote name to (audio_file, start_time, end_time, padding_ms)
 # Times are in seconds from the Fireflies JSON
@@ -153,66 +156,70 @@ CLIP_EXTRACTIONS = {
     },
 }
 
-def extract_clip(clip_name, config, output_dir="ad_clips"):
-    """Extract a single clip using the provided config."""
-
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
-
-    audio_file = config["file"]
-    start_sec = config["start"]
-    end_sec = config["end"]
-    padding_ms = config["padding"]
-
-    print(f"\nExtracting: {clip_name}")
-    print(f"  Source: {audio_file}")
-    print(f"  Time: {start_sec:.2f}s - {end_sec:.2f}s (duration: {end_sec - start_sec:.2f}s)")
-
-    # Load audio
-    audio = AudioSegment.from_file(audio_file)
-
-    # Convert to milliseconds and add padding
-    start_ms = max(0, int(start_sec * 1000) - padding_ms)
-    end_ms = min(len(audio), int(end_sec * 1000) + padding_ms)
-
-    # Extract clip
-    clip = audio[start_ms:end_ms]
-
-    # Save
-    output_file = output_path / f"{clip_name}.wav"
-    clip.export(output_file, format="wav")
-
-    print(f"  ✓ Saved: {output_file} ({len(clip)/1000:.2f}s)")
-
-    return str(output_file)
+def edl_record(config):
+    """Turn a CLIP_EXTRACTIONS entry into an EDL record (padding applied)."""
+    return make_record(
+        config["file"],
+        int(config["start"] * 1000) - config["padding"],
+        int(config["end"] * 1000) + config["padding"]
+    )
 
 def main():
+    parser = argparse.ArgumentParser(description="Extract full ad clips from known timestamps")
+    parser.add_argument("--output-dir", default="ad_clips",
+                       help="Output directory (default: ad_clips)")
+    parser.add_argument("--workers", type=int, default=4,
+                       help="Threads used to render clips (default: 4)")
+    parser.add_argument("--seek", action="store_true",
+                       help="Decode only each clip's time range (fast for a few clips)")
+    parser.add_argument("--edl-only", action="store_true",
+                       help="Only record the clips in the EDL (e.g. for clip_server.py)")
+    parser.add_argument("clips", nargs="*",
+                       help="Only extract these clip names (default: all)")
+
+    args = parser.parse_args()
+
+    unknown = [name for name in args.clips if name not in CLIP_EXTRACTIONS]
+    if unknown:
+        print(f"Error: Unknown clip(s): {', '.join(unknown)}")
+        return 1
+
+    selected = {name: config for name, config in CLIP_EXTRACTIONS.items()
+                if not args.clips or name in args.clips}
+
     print("="*60)
     print("EXTRACTING FULL AD CLIPS WITH COMPLETE TEXT")
     print("="*60)
-    print(f"\nExtracting {len(CLIP_EXTRACTIONS)} clips...")
+    print(f"\nExtracting {len(selected)} clips...")
 
-    extracted = []
+    # Record the clips in the EDL; only ranges not already rendered are cut
+    edl = load_edl()
+    for name, config in selected.items():
+        edl["clips"][name] = edl_record(config)
+    save_edl(edl)
+    if args.edl_only:
+        print(f"✓ Recorded {len(selected)} clips in the EDL")
+        return 0
 
-    for clip_name, config in CLIP_EXTRACTIONS.items():
-        try:
-            output_file = extract_clip(clip_name, config)
-            extracted.append(clip_name)
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
+    exported = export_clips(list(selected), args.output_dir, edl,
+                            workers=args.workers, seek=True if args.seek else None)
+    extracted = [Path(f).stem for f in exported]
 
     print(f"\n{'='*60}")
     print(f"EXTRACTION COMPLETE")
     print(f"{'='*60}")
-    print(f"Successfully extracted {len(extracted)}/{len(CLIP_EXTRACTIONS)} clips:")
-    for name in extracted:
-        print(f"  ✓ {name}")
+    print(f"Successfully extracted {len(extracted)}/{len(selected)} clips:")
+    for name in selected:
+        if name in extracted:
+            print(f"  ✓ {name}")
 
-    if len(extracted) < len(CLIP_EXTRACTIONS):
+    if len(extracted) < len(selected):
         print(f"\nFailed clips:")
-        for name in CLIP_EXTRACTIONS:
+        for name in selected:
             if name not in extracted:
                 print(f"  ✗ {name}")
 
+    return 0
+
 if __name__ == "__main__":
-    main()
+    exit(main())
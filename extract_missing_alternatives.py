@@ -3,15 +3,10 @@
 import os
 os.chdir('/Users/katiemuscarella/Projects/field/ads')
 
-from extract_clips import AudioClipExtractor
+from quote_client import extract_quote
 
-# Initialize extractor
-extractor = AudioClipExtractor("audio/matt 1.m4a", model_size="base")
-
-# Load audio and transcribe
-print("Loading audio and transcribing...")
-extractor.load_audio()
-extractor.transcribe()
+# Uses the warm transcripts in quote_server.py (start it first)
+audio_file = "audio/matt 1.m4a"
 
 # Alternative clips with their quotes
 alternatives = [
@@ -34,20 +29,13 @@ for filename, quote in alternatives:
     print(f"Extracting: {filename}")
     print(f"Quote: {quote[:60]}...")
 
-    match = extractor.find_quote_timestamps(quote)
+    result = extract_quote(quote, filename, audio_file=audio_file, padding_ms=500)
+    match = result['match']
 
     if match:
         print(f"  ✓ Found match (score: {match['score']}%)")
         print(f"    Timestamp: {match['start_time']:.1f}s - {match['end_time']:.1f}s")
 
-        output_path = filename
-        extractor.extract_clip(
-            match['start_time'],
-            match['end_time'],
-            output_path,
-            padding_ms=500
-        )
-
         duration = (match['end_time'] - match['start_time'])
         print(f"    Saved: {filename} ({duration:.1f}s)\n")
     else:
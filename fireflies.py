@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Load Fireflies JSON exports as transcripts.
+Fireflies sentences are converted to the same segment/word structure that
+Whisper produces, so quotes can be matched without running Whisper at all.
+"""
+
+import json
+import os
+from pathlib import Path
+
+# Fireflies exports available for each interview recording
+FIREFLIES_EXPORTS = {
+    "audio/matt 1.m4a": "Atwood-Rd_2025-11-07T20-58-43-655Z.json",
+    "audio/matt 3.m4a": "New-Recording-43_2025-11-07T20-35-44-180Z.json",
+}
+
+
+def find_fireflies_export(audio_file):
+    """
+    Return the Fireflies export for an audio file, or None.
+
+    Args:
+        audio_file: Path to the audio file (relative or absolute)
+    """
+    base_dir = Path(__file__).resolve().parent
+    audio_path = os.path.abspath(str(audio_file))
+
+    for recording, export in FIREFLIES_EXPORTS.items():
+        if os.path.abspath(recording) == audio_path or (base_dir / recording) == Path(audio_path):
+            export_path = base_dir / export
+            if export_path.exists():
+                return str(export_path)
+
+    return None
+
+
+def _estimate_words(text, start, end):
+    """
+    Spread a sentence's duration over its words by character length.
+
+    Fireflies only times whole sentences, so word timings are estimates.
+    """
+    words = text.split()
+    if not words:
+        return []
+
+    total_chars = sum(len(w) for w in words)
+    duration = end - start
+    result = []
+    position = start
+
+    for word in words:
+        word_duration = duration * len(word) / total_chars
+        result.append({
+            'word': f" {word}",
+            'start': round(position, 3),
+            'end': round(position + word_duration, 3),
+            'estimated': True
+        })
+        position += word_duration
+
+    return result
+
+
+def load_fireflies_transcript(json_path):
+    """
+    Load a Fireflies export in Whisper's result format.
+
+    Each Fireflies sentence becomes a segment with its speaker, start and end
+    time, and estimated word timestamps.
+
+    Args:
+        json_path: Path to the Fireflies JSON export
+
+    Returns:
+        Dictionary with 'text', 'segments', 'language' and 'source'
+    """
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    segments = []
+    for sentence in data['sentences']:
+        text = sentence['text'].strip()
+        segments.append({
+            'id': sentence['index'],
+            'start': sentence['start_time'],
+            'end': sentence['end_time'],
+            'text': f" {text}",
+            'speaker': sentence.get('speaker_name'),
+            'words': _estimate_words(text, sentence['start_time'], sentence['end_time'])
+        })
+
+    return {
+        'text': ''.join(s['text'] for s in segments),
+        'segments': segments,
+        'language': 'en',
+        'source': 'fireflies'
+    }
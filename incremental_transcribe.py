@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Re-transcribe only the parts of a recording that changed.
+Each cached transcript is stored with an energy-envelope fingerprint of its
+audio. When a recording is re-uploaded with, say, a trimmed intro or an
+extra tail, its 30 second chunks are located in the new audio (allowing for
+a time shift), their words are reused at the shifted times, and Whisper is
+only run on the spans no old chunk covers.
+"""
+
+import numpy as np
+
+from parallel_transcribe import trim_segments
+
+SAMPLE_RATE = 16000
+
+# Envelope resolution, and the chunk size old audio is matched in
+ENVELOPE_MS = 10
+CHUNK_SECONDS = 30
+
+# A chunk matches if its envelope is within this many dB on average
+MATCH_TOLERANCE_DB = 3.0
+
+# Number of whole-file alignments tried for each chunk
+MAX_OFFSETS = 3
+
+# Extra audio transcribed either side of a changed span, so words on its
+# edges are heard in full
+GAP_MARGIN_SECONDS = 1.0
+
+# Changed spans shorter than this are not worth a Whisper call
+MIN_GAP_SECONDS = 0.5
+
+
+def energy_envelope(samples):
+    """
+    Fingerprint a recording as its frame energy in dB.
+
+    Args:
+        samples: The recording as 16kHz float samples (whisper.load_audio())
+
+    Returns:
+        int8 array with one value per ENVELOPE_MS of audio
+    """
+    frame_len = SAMPLE_RATE * ENVELOPE_MS // 1000
+    count = len(samples) // frame_len
+    frames = samples[:count * frame_len].reshape(count, frame_len)
+    energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    return np.clip(np.round(energy_db), -100, 0).astype(np.int8)
+
+
+def _candidate_offsets(old, new, count=MAX_OFFSETS):
+    """Best whole-file alignments (new frame - old frame), via FFT cross-correlation."""
+    a = old.astype(np.float32) - old.mean()
+    b = new.astype(np.float32) - new.mean()
+    size = 1 << int(np.ceil(np.log2(len(a) + len(b))))
+    corr = np.fft.irfft(np.fft.rfft(b, size) * np.conj(np.fft.rfft(a, size)), size)
+
+    # Lags from -(len(old) - 1) to len(new) - 1
+    lags = np.concatenate((np.arange(0, len(b)), np.arange(-len(a) + 1, 0)))
+    corr = np.concatenate((corr[:len(b)], corr[size - len(a) + 1:]))
+
+    offsets = []
+    suppress = 1000 // ENVELOPE_MS
+    for _ in range(count):
+        best = int(np.argmax(corr))
+        if corr[best] == -np.inf:
+            break
+        offsets.append(int(lags[best]))
+        corr[max(0, best - suppress):best + suppress + 1] = -np.inf
+    return offsets
+
+
+def match_chunks(old, new):
+    """
+    Locate the old recording's chunks in the new one.
+
+    Returns:
+        List of (old_start, new_start, length) in envelope frames, for every
+        chunk found unchanged, in old order
+    """
+    chunk = CHUNK_SECONDS * 1000 // ENVELOPE_MS
+    candidates = [0] + _candidate_offsets(old, new)
+    matches = []
+    previous = None
+
+    for chunk_start in range(0, len(old), chunk):
+        chunk_end = min(len(old), chunk_start + chunk)
+        tried = [previous] + candidates if previous is not None else candidates
+
+        best = None
+        for offset in dict.fromkeys(tried):
+            # Chunks hanging off either end of the new audio (a trimmed intro
+            # or tail) are compared on the part that is still there
+            old_start = max(chunk_start, -offset)
+            old_end = min(chunk_end, len(new) - offset)
+            if old_end - old_start < (chunk_end - chunk_start) // 2:
+                continue
+            diff = np.mean(np.abs(
+                new[old_start + offset:old_end + offset].astype(np.int16)
+                - old[old_start:old_end].astype(np.int16)
+            ))
+            if diff <= MATCH_TOLERANCE_DB and (best is None or diff < best[0]):
+                best = (diff, offset, old_start, old_end)
+
+        if best:
+            _, previous, old_start, old_end = best
+            matches.append((old_start, old_start + previous, old_end - old_start))
+
+    return matches
+
+
+def retranscribe_changes(old_result, old_envelope, new_envelope, transcribe_range_fn):
+    """
+    Build a transcript for changed audio from an old transcript.
+
+    Args:
+        old_result: Whisper result for the old recording
+        old_envelope: energy_envelope() of the old recording
+        new_envelope: energy_envelope() of the new recording
+        transcribe_range_fn: Callable(start_seconds, end_seconds) that
+            transcribes part of the new recording, with times relative to
+            start_seconds
+
+    Returns:
+        Whisper result dictionary for the new recording, or None if no part
+        of the old recording was found in it
+    """
+    frame = ENVELOPE_MS / 1000
+    matches = match_chunks(old_envelope, new_envelope)
+    if not matches:
+        return None
+
+    # Pieces of the new timeline reused from the old one (without overlaps,
+    # if material was repeated), then the gaps between them
+    pieces = []
+    position = 0.0
+    gaps = []
+    for new_start, old_start, length in sorted((n, o, l) for o, n, l in matches):
+        lo = max(position, new_start * frame)
+        hi = (new_start + length) * frame
+        if hi <= lo:
+            continue
+        if lo - position >= MIN_GAP_SECONDS:
+            gaps.append((position, lo))
+        pieces.append((lo, hi, (new_start - old_start) * frame))
+        position = hi
+    new_duration = len(new_envelope) * frame
+    if new_duration - position >= MIN_GAP_SECONDS:
+        gaps.append((position, float('inf')))
+
+    reused = sum(hi - lo for lo, hi, _ in pieces)
+    print(f"Reusing {reused/60:.1f} min of the previous transcript, "
+          f"re-transcribing {len(gaps)} changed span(s)")
+
+    segments = []
+    for lo, hi, offset in pieces:
+        for segment in trim_segments(old_result['segments'], lo - offset, hi - offset):
+            segments.append(_shift_segment(segment, offset))
+
+    for lo, hi in gaps:
+        start = max(0.0, lo - GAP_MARGIN_SECONDS)
+        end = min(new_duration, hi + GAP_MARGIN_SECONDS)
+        print(f"  Transcribing {start:.1f}s - {end:.1f}s")
+        result = transcribe_range_fn(start, end)
+        shifted = [_shift_segment(s, start) for s in result['segments']]
+        segments.extend(trim_segments(shifted, lo, hi))
+
+    segments.sort(key=lambda s: s['start'])
+    segments = [dict(s, id=i) for i, s in enumerate(segments)]
+
+    return {
+        'text': ''.join(s['text'] for s in segments),
+        'segments': segments,
+        'language': old_result.get('language')
+    }
+
+
+def _shift_segment(segment, offset):
+    segment = dict(segment, start=round(segment['start'] + offset, 3), end=round(segment['end'] + offset, 3))
+    if 'words' in segment:
+        segment['words'] = [
+            dict(w, start=round(w['start'] + offset, 3), end=round(w['end'] + offset, 3))
+            for w in segment['words']
+        ]
+    return segment
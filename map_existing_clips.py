@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 """
 Map existing extracted clips to ad_clips directory based on text matching.
+Matches are recorded as EDL records (edl.py) pointing at the source range,
+not copied, and exported into ad_clips/ through the render cache.
 """
 
 import json
-import shutil
+import wave
 from pathlib import Path
 from fuzzywuzzy import fuzz
 
+from edl import export_clips, load_edl, make_record, save_edl
+
 # Ad quotes we're looking for
 AD_QUOTES = {
     "heirloom_forever": "There's something really meaningful that it's an heirloom and it'll be with you forever",
@@ -52,6 +56,27 @@ def find_best_match(clip_text, threshold=60):
         return best_match, best_score
     return None, 0
 
+def clip_record(script_dir, clip_number, wav_file):
+    """
+    EDL record for an extracted clip.
+
+    Uses the clip's range in its source recording from metadata.json when
+    the WAV is the one described there, otherwise the whole WAV.
+    """
+    metadata_file = script_dir / "metadata.json"
+    if metadata_file.exists():
+        with open(metadata_file, 'r') as f:
+            metadata = json.load(f)
+        for clip in metadata["clips"]:
+            if (clip["clip_number"] == clip_number and clip["status"] == "success"
+                    and clip["filename"] == wav_file.name):
+                source = clip.get("source_file", metadata["source_file"])
+                return make_record(source, clip["start_ms"], clip["end_ms"])
+
+    with wave.open(str(wav_file), 'rb') as w:
+        duration_ms = int(w.getnframes() * 1000 / w.getframerate())
+    return make_record(wav_file, 0, duration_ms)
+
 def map_clips():
     """Map existing clips to ad_clips directory."""
 
@@ -59,6 +84,7 @@ def map_clips():
     output_dir.mkdir(exist_ok=True)
 
     mapped = {}
+    edl = load_edl()
     script_dirs = sorted(Path(".").glob("script_*"))
 
     print(f"Found {len(script_dirs)} script directories")
@@ -96,9 +122,8 @@ def map_clips():
             if match_name and match_name not in mapped:
                 print(f"  ✓ Clip {i}: {match_name} (score: {score}%)")
 
-                # Copy to ad_clips
-                dest_file = output_dir / f"{match_name}.wav"
-                shutil.copy2(wav_file, dest_file)
+                # Record the range in the EDL instead of copying the WAV
+                edl["clips"][match_name] = clip_record(script_dir, i, wav_file)
 
                 mapped[match_name] = {
                     "source": str(wav_file),
@@ -106,6 +131,11 @@ def map_clips():
                     "clip_text": clip_text[:100] + "..."
                 }
 
+    save_edl(edl)
+    if mapped:
+        print()
+        export_clips(list(mapped), str(output_dir), edl)
+
     # Save mapping
     with open(output_dir / "mapping.json", 'w') as f:
         json.dump(mapped, f, indent=2)
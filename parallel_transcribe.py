@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Transcribe one recording on several CPU cores.
+The audio is split into overlapping chunks at quiet points, each chunk is
+transcribed by a worker process with its own Whisper model, and the word
+timestamps are stitched back together, keeping each overlapping word from
+the chunk whose half of the overlap it falls in.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import whisper
+
+SAMPLE_RATE = 16000
+
+# Longest and shortest nominal chunk (chunks are sized so every worker gets
+# one), and how much neighbouring chunks overlap
+CHUNK_SECONDS = 300
+MIN_CHUNK_SECONDS = 60
+OVERLAP_SECONDS = 10
+
+# Each cut is moved to the quietest frame this close to its nominal position
+CUT_SEARCH_SECONDS = 5
+CUT_FRAME_MS = 50
+
+# Per-process state, set up by _init_worker
+_WORKER_MODEL = None
+
+
+def find_cut_points(samples, chunk_seconds=CHUNK_SECONDS, search_seconds=CUT_SEARCH_SECONDS):
+    """
+    Choose where to split a recording, preferring quiet moments.
+
+    Args:
+        samples: Mono float32 samples at SAMPLE_RATE
+
+    Returns:
+        Sample positions of the chunk boundaries, from 0 to len(samples)
+    """
+    frame_len = SAMPLE_RATE * CUT_FRAME_MS // 1000
+    search = search_seconds * SAMPLE_RATE
+    cuts = [0]
+
+    for nominal in range(chunk_seconds * SAMPLE_RATE, len(samples), chunk_seconds * SAMPLE_RATE):
+        lo = max(cuts[-1] + frame_len, nominal - search)
+        hi = min(len(samples), nominal + search)
+        count = (hi - lo) // frame_len
+        if count == 0:
+            continue
+        frames = samples[lo:lo + count * frame_len].reshape(count, frame_len)
+        quietest = int(np.argmin(np.mean(frames * frames, axis=1)))
+        cuts.append(lo + quietest * frame_len + frame_len // 2)
+
+    # Don't leave a sliver of a final chunk
+    if len(cuts) > 1 and len(samples) - cuts[-1] < search:
+        cuts.pop()
+    cuts.append(len(samples))
+    return cuts
+
+
+def _init_worker(model_size, threads):
+    """Load one model per worker process, limited to its share of the cores."""
+    global _WORKER_MODEL
+    import torch
+    torch.set_num_threads(threads)
+    _WORKER_MODEL = whisper.load_model(model_size)
+
+
+def _transcribe_chunk(samples, offset, options):
+    """Transcribe one chunk in a worker and shift its times by offset seconds."""
+    result = _WORKER_MODEL.transcribe(samples, **options)
+
+    segments = []
+    for segment in result['segments']:
+        segment = dict(
+            segment,
+            start=round(segment['start'] + offset, 3),
+            end=round(segment['end'] + offset, 3)
+        )
+        if 'words' in segment:
+            segment['words'] = [
+                dict(w, start=round(w['start'] + offset, 3), end=round(w['end'] + offset, 3))
+                for w in segment['words']
+            ]
+        segments.append(segment)
+
+    return {'segments': segments, 'language': result.get('language')}
+
+
+def _keep(start, end, lo, hi):
+    """True if a span's midpoint falls in [lo, hi)."""
+    return lo <= (start + end) / 2 < hi
+
+
+def trim_segments(segments, lo, hi):
+    """
+    Keep only the words (and segments) whose midpoint falls in [lo, hi).
+
+    Segments that lose words are shortened to the words they keep.
+
+    Args:
+        segments: Whisper segments
+        lo: Start of the kept range in seconds
+        hi: End of the kept range in seconds
+
+    Returns:
+        List of trimmed segments (ids are not renumbered)
+    """
+    trimmed = []
+
+    for segment in segments:
+        if 'words' not in segment:
+            if _keep(segment['start'], segment['end'], lo, hi):
+                trimmed.append(segment)
+            continue
+
+        words = [w for w in segment['words'] if _keep(w['start'], w['end'], lo, hi)]
+        if not words:
+            continue
+        if len(words) < len(segment['words']):
+            segment = dict(
+                segment,
+                start=words[0]['start'],
+                end=words[-1]['end'],
+                text=''.join(w['word'] for w in words)
+            )
+        trimmed.append(dict(segment, words=words))
+
+    return trimmed
+
+
+def stitch_chunks(results, cuts):
+    """
+    Join chunk transcriptions into one Whisper result.
+
+    Each chunk owns the time between its two cut points (the middle of the
+    overlaps), so words transcribed twice are only kept once.
+
+    Args:
+        results: Per-chunk results with times on the original timeline
+        cuts: Cut points in samples, one more than there are results
+
+    Returns:
+        Whisper result dictionary
+    """
+    segments = []
+    language = None
+
+    for i, result in enumerate(results):
+        language = language or result['language']
+        lo = cuts[i] / SAMPLE_RATE
+        hi = cuts[i + 1] / SAMPLE_RATE if i + 1 < len(results) else float('inf')
+
+        for segment in trim_segments(result['segments'], lo, hi):
+            segments.append(dict(segment, id=len(segments)))
+
+    return {
+        'text': ''.join(s['text'] for s in segments),
+        'segments': segments,
+        'language': language
+    }
+
+
+def transcribe_parallel(audio_file, model_size="base", workers=None, threads_per_worker=None,
+                        samples=None, **options):
+    """
+    Transcribe a recording in overlapping chunks across worker processes.
+
+    Args:
+        audio_file: Path to the audio file
+        model_size: Whisper model size (each worker loads its own copy)
+        workers: Number of worker processes (default: one per core)
+        threads_per_worker: Torch threads per worker (default: cores / workers)
+        samples: The file already decoded by whisper.load_audio(), if it is
+        **options: Passed to model.transcribe() (e.g. word_timestamps=True)
+
+    Returns:
+        Whisper result dictionary, in the same format as model.transcribe()
+    """
+    cores = os.cpu_count() or 1
+    workers = workers or cores
+    threads_per_worker = threads_per_worker or max(1, cores // workers)
+
+    if samples is None:
+        samples = whisper.load_audio(str(audio_file))
+    duration = len(samples) // SAMPLE_RATE
+    chunk_seconds = max(MIN_CHUNK_SECONDS, min(CHUNK_SECONDS, -(-duration // workers)))
+    cuts = find_cut_points(samples, chunk_seconds)
+    overlap = OVERLAP_SECONDS * SAMPLE_RATE // 2
+    workers = min(workers, len(cuts) - 1)
+
+    print(f"Transcribing {len(cuts) - 1} chunks with {workers} workers "
+          f"({threads_per_worker} threads each)...")
+
+    # spawn, not fork: torch's thread pools don't survive a fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(model_size, threads_per_worker)) as pool:
+        futures = []
+        for start, end in zip(cuts, cuts[1:]):
+            lo = max(0, start - overlap)
+            hi = min(len(samples), end + overlap)
+            futures.append(pool.submit(_transcribe_chunk, samples[lo:hi], lo / SAMPLE_RATE, options))
+
+        results = []
+        for i, future in enumerate(futures, 1):
+            results.append(future.result())
+            print(f"  Chunk {i}/{len(futures)} done")
+
+    return stitch_chunks(results, cuts)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped raw PCM cache of decoded recordings.
+Each source is decoded through ffmpeg once into .pcm_cache/<sha256>.pcm
+(signed little-endian at the source's rate and channels, 16-bit for
+compressed sources and 32-bit for 24-bit or float ones, as pydub decodes
+them) with a small JSON header sidecar. Later opens, in any process,
+memory-map that file, so slicing a few seconds touches only those pages
+instead of decoding the whole interview. The cache is capped in size; least
+recently opened recordings are evicted. The index is updated under a file
+lock, so the clip server and the exporters can share one cache.
+
+audio_cache.load_audio() returns these, so the extractors, combiners and
+clip server all share one decode per recording.
+"""
+
+import fcntl
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import get_encoder_name
+
+from audio_cache import pcm_format_args, probe_audio, probe_sample_width
+from transcript_cache import file_sha256
+
+DEFAULT_CACHE_DIR = ".pcm_cache"
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024  # 4 GB, ~6 hours of 48kHz stereo
+
+# Sample width -> numpy dtype of the PCM file
+DTYPES = {2: '<i2', 4: '<i4'}
+
+# (absolute path, mtime_ns) -> PCMAudio
+_OPEN = {}
+_LOCK = threading.Lock()
+
+
+class PCMAudio:
+    def __init__(self, source_file, pcm_path, header):
+        """
+        A decoded recording, memory-mapped.
+
+        Args:
+            source_file: The recording this was decoded from
+            pcm_path: Path to the raw PCM file
+            header: Sidecar dict with sample_rate, channels, sample_width, frames
+        """
+        self.source_file = source_file
+        self.pcm_path = pcm_path
+        self.sample_rate = header["sample_rate"]
+        self.frame_rate = self.sample_rate
+        self.channels = header["channels"]
+        self.sample_width = header.get("sample_width", 2)
+        self.frames = header["frames"]
+        # (frames, channels) int16 or int32, paged in on access
+        self.samples = np.memmap(pcm_path, dtype=DTYPES[self.sample_width], mode='r',
+                                 shape=(self.frames, self.channels))
+
+    @property
+    def duration_ms(self):
+        return self.frames * 1000 // self.sample_rate
+
+    def __len__(self):
+        """Length in milliseconds, like AudioSegment."""
+        return self.duration_ms
+
+    def frame_at(self, ms):
+        """Frame index for a time in milliseconds, clamped to the recording."""
+        # Same frame arithmetic as AudioSegment.__getitem__
+        return min(self.frames, int(max(0, ms) * (self.sample_rate / 1000.0)))
+
+    def slice(self, start_ms, end_ms):
+        """Zero-copy (frames, channels) view of a time range."""
+        return self.samples[self.frame_at(start_ms):self.frame_at(end_ms)]
+
+    def segment(self, start_ms, end_ms):
+        """Copy a time range out as an AudioSegment."""
+        return AudioSegment(
+            data=self.slice(start_ms, end_ms).tobytes(),
+            sample_width=self.sample_width,
+            frame_rate=self.sample_rate,
+            channels=self.channels
+        )
+
+    def __getitem__(self, ms):
+        """audio[start_ms:end_ms] returns an AudioSegment, like pydub."""
+        if not isinstance(ms, slice) or ms.step is not None:
+            raise TypeError("PCMAudio only supports [start_ms:end_ms] slices")
+        start = 0 if ms.start is None else ms.start
+        end = self.duration_ms if ms.stop is None else ms.stop
+        if start < 0:
+            start += self.duration_ms
+        if end < 0:
+            end += self.duration_ms
+        return self.segment(start, end)
+
+
+def _load_index(cache_dir):
+    """Load the cache index: content hashes by path, and cached PCM by hash."""
+    index_path = Path(cache_dir) / "index.json"
+    if not index_path.exists():
+        return {"hashes": {}, "entries": {}}
+    with open(index_path, 'r') as f:
+        index = json.load(f)
+    if "hashes" not in index:
+        # Older index: only the content hashes
+        index = {"hashes": index, "entries": {}}
+    return index
+
+
+def _temp_file(path):
+    """A unique temp file next to path, so concurrent writers never share one."""
+    return tempfile.NamedTemporaryFile(dir=Path(path).parent, prefix=f".{Path(path).name}.",
+                                       suffix=".tmp", delete=False)
+
+
+def _write_json(path, data):
+    with _temp_file(path) as f:
+        f.write(json.dumps(data, indent=2).encode('utf-8'))
+    os.replace(f.name, path)
+
+
+def _save_index(index, cache_dir):
+    _write_json(Path(cache_dir) / "index.json", index)
+
+
+@contextmanager
+def _index_lock(cache_dir):
+    """
+    Hold an exclusive lock on the cache index across processes.
+
+    _LOCK only serializes this process's threads; every read-modify-write of
+    the index also takes this, so concurrent processes never lose each
+    other's entries.
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(cache_dir) / "index.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _content_hash(audio_file, cache_dir):
+    """SHA-256 of a file, remembered per path, size and mtime in the cache index."""
+    index = _load_index(cache_dir)
+
+    path = os.path.abspath(audio_file)
+    stat = os.stat(path)
+    known = index["hashes"].get(path)
+    if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+        return known["sha256"]
+
+    sha256 = file_sha256(path)
+    with _index_lock(cache_dir):
+        index = _load_index(cache_dir)
+        index["hashes"][path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+        _save_index(index, cache_dir)
+    return sha256
+
+
+def decode_to_pcm(audio_file, pcm_path, header_path):
+    """Decode a recording straight to a raw PCM file and write its header."""
+    sample_rate, channels = probe_audio(audio_file)
+    sample_width = probe_sample_width(audio_file)
+    print(f"Decoding {audio_file} to the PCM cache...")
+
+    command = [
+        get_encoder_name(), '-v', 'error',
+        '-i', str(audio_file),
+        '-vn',
+        *pcm_format_args(sample_width),
+        '-ac', str(channels), '-ar', str(sample_rate),
+        '-'
+    ]
+    # A unique temp file, so processes decoding the same recording at once
+    # don't write into each other's output
+    with _temp_file(pcm_path) as f:
+        tmp_path = Path(f.name)
+        result = subprocess.run(command, stdout=f, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg failed to decode {audio_file}: {result.stderr.decode(errors='replace')}")
+
+    header = {
+        "source_file": str(audio_file),
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "sample_width": sample_width,
+        "frames": os.path.getsize(tmp_path) // (sample_width * channels)
+    }
+    # Published and indexed together, so another process's evict() never
+    # sees the file without its entry
+    cache_dir = Path(pcm_path).parent
+    with _index_lock(cache_dir):
+        os.replace(tmp_path, pcm_path)
+        _write_json(header_path, header)
+        _add_entry(Path(pcm_path).stem, cache_dir)
+    return header
+
+
+def _paths(sha256, cache_dir):
+    return Path(cache_dir) / f"{sha256}.pcm", Path(cache_dir) / f"{sha256}.json"
+
+
+def cached_pcm(audio_file, cache_dir=DEFAULT_CACHE_DIR):
+    """Return a recording's PCMAudio if it has been decoded before, else None."""
+    path = os.path.abspath(str(audio_file))
+    with _LOCK:
+        pcm = _OPEN.get((path, os.stat(path).st_mtime_ns))
+        if pcm is not None:
+            return pcm
+        if not (Path(cache_dir) / "index.json").exists():
+            return None
+        pcm_path, header_path = _paths(_content_hash(path, cache_dir), cache_dir)
+
+    if pcm_path.exists() and header_path.exists():
+        return open_pcm(audio_file, cache_dir)
+    return None
+
+
+def _add_entry(sha256, cache_dir):
+    """Index a cached recording as opened now; the caller holds _index_lock()."""
+    pcm_path, _ = _paths(sha256, cache_dir)
+    index = _load_index(cache_dir)
+    index["entries"][sha256] = {"size": pcm_path.stat().st_size, "last_access": time.time()}
+    _save_index(index, cache_dir)
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, keep=None):
+    """
+    Delete least recently opened recordings until the cache fits max_bytes.
+
+    Recordings open in this process (and `keep`) are never evicted. Other
+    processes that have one mapped keep reading it; the file is only
+    unlinked.
+
+    Returns:
+        Number of recordings removed
+    """
+    with _index_lock(cache_dir):
+        index = _load_index(cache_dir)
+        entries = index["entries"]
+
+        # Recordings decoded before the index tracked them count as opened when
+        # they were written
+        for pcm_path in Path(cache_dir).glob("*.pcm"):
+            entries.setdefault(pcm_path.stem, {"size": pcm_path.stat().st_size,
+                                               "last_access": pcm_path.stat().st_mtime})
+        for sha256 in [s for s in entries if not _paths(s, cache_dir)[0].exists()]:
+            del entries[sha256]
+
+        in_use = {Path(pcm.pcm_path).stem for pcm in _OPEN.values()}
+        total = sum(e["size"] for e in entries.values())
+        removed = 0
+        for sha256 in sorted(entries, key=lambda s: entries[s]["last_access"]):
+            if total <= max_bytes:
+                break
+            if sha256 == keep or sha256 in in_use:
+                continue
+            for path in _paths(sha256, cache_dir):
+                path.unlink(missing_ok=True)
+            total -= entries.pop(sha256)["size"]
+            removed += 1
+
+        _save_index(index, cache_dir)
+        return removed
+
+
+def close_all():
+    """Forget every open recording (their maps close once unreferenced)."""
+    with _LOCK:
+        _OPEN.clear()
+
+
+def open_pcm(audio_file, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Return a recording as memory-mapped PCM, decoding it on first use.
+
+    Args:
+        audio_file: Path to the recording
+        cache_dir: Directory holding the PCM files
+        max_bytes: Size cap for the cache, enforced after each new decode
+
+    Returns:
+        PCMAudio
+    """
+    path = os.path.abspath(str(audio_file))
+    key = (path, os.stat(path).st_mtime_ns)
+
+    with _LOCK:
+        pcm = _OPEN.get(key)
+        if pcm is None:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            sha256 = _content_hash(path, cache_dir)
+            pcm_path, header_path = _paths(sha256, cache_dir)
+
+            # Mapped under the index lock, so no other process can evict
+            # the file between the check and the map
+            with _index_lock(cache_dir):
+                if pcm_path.exists() and header_path.exists():
+                    with open(header_path, 'r') as f:
+                        pcm = PCMAudio(str(audio_file), pcm_path, json.load(f))
+                    _add_entry(sha256, cache_dir)
+            decoded = pcm is None
+            if decoded:
+                header = decode_to_pcm(audio_file, pcm_path, header_path)
+                pcm = PCMAudio(str(audio_file), pcm_path, header)
+
+            for stale in [k for k in _OPEN if k[0] == path]:
+                del _OPEN[stale]
+            _OPEN[key] = pcm
+            if decoded:
+                evict(cache_dir, max_bytes, keep=sha256)
+
+    return pcm
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Waveform peak files for the HTML players.
+Each exported clip gets a small .peaks file next to its WAV with the min/max
+sample of every block of samples at a few zoom levels, so the players can
+draw a waveform from a few KB instead of downloading and decoding the WAV.
+waveform.js reads this format for the players.
+
+File layout (little-endian):
+    b"PEAK", uint8 version, uint8 bits (8), uint16 level count,
+    uint32 sample rate, uint32 frames,
+    per level: uint32 frames per peak, uint32 peak count,
+    then each level's peaks as int8 (min, max) pairs, finest level first
+"""
+
+import argparse
+import struct
+from pathlib import Path
+
+import numpy as np
+
+PEAKS_VERSION = 1
+
+# Frames per peak at each zoom level; each level is a whole multiple of the
+# one before so coarser levels are reduced from the finest
+PEAK_LEVELS = (512, 2048, 8192)
+
+
+def segment_samples(segment):
+    """Return an AudioSegment's samples as a (frames, channels) int array."""
+    samples = np.asarray(segment.get_array_of_samples())
+    return samples.reshape(-1, segment.channels)
+
+
+def compute_peaks(samples, sample_width, levels=PEAK_LEVELS):
+    """
+    Compute int8 min/max peaks at several zoom levels.
+
+    Args:
+        samples: (frames, channels) integer samples
+        sample_width: Bytes per sample, for scaling to int8
+        levels: Frames per peak at each level
+
+    Returns:
+        List of (frames_per_peak, (count, 2) int8 array) per level
+    """
+    finest = levels[0]
+    count = -(-len(samples) // finest)
+    if count == 0:
+        return [(frames_per_peak, np.zeros((0, 2), np.int8)) for frames_per_peak in levels]
+
+    # Pad with the last frame so the final partial block doesn't gain a
+    # spurious zero
+    padded = np.empty((count * finest, samples.shape[1]), dtype=samples.dtype)
+    padded[:len(samples)] = samples
+    padded[len(samples):] = samples[-1] if len(samples) else 0
+
+    blocks = padded.reshape(count, -1)
+    lows = blocks.min(axis=1)
+    highs = blocks.max(axis=1)
+
+    result = []
+    for frames_per_peak in levels:
+        factor = frames_per_peak // finest
+        level_count = -(-count // factor)
+        pad = level_count * factor - count
+        level_lows = np.pad(lows, (0, pad), mode='edge').reshape(level_count, factor).min(axis=1)
+        level_highs = np.pad(highs, (0, pad), mode='edge').reshape(level_count, factor).max(axis=1)
+
+        scale = 127 / (1 << (8 * sample_width - 1))
+        peaks = np.stack((level_lows, level_highs), axis=1).astype(np.float64) * scale
+        result.append((frames_per_peak, np.clip(np.round(peaks), -127, 127).astype(np.int8)))
+
+    return result
+
+
+def peaks_path(wav_file):
+    """The .peaks file that belongs to a WAV."""
+    return Path(wav_file).with_suffix('.peaks')
+
+
+def write_peaks(segment, wav_file, levels=PEAK_LEVELS):
+    """
+    Write the peak file for a clip that was just exported.
+
+    Args:
+        segment: The AudioSegment that was exported (no re-decode needed)
+        wav_file: Path the WAV was saved to; the peaks go next to it
+
+    Returns:
+        Path to the .peaks file
+    """
+    samples = segment_samples(segment)
+    levels = compute_peaks(samples, segment.sample_width, levels)
+
+    header = struct.pack('<4sBBHII', b'PEAK', PEAKS_VERSION, 8, len(levels),
+                         segment.frame_rate, len(samples))
+    for frames_per_peak, peaks in levels:
+        header += struct.pack('<II', frames_per_peak, len(peaks))
+
+    output_file = peaks_path(wav_file)
+    with open(output_file, 'wb') as f:
+        f.write(header)
+        for _, peaks in levels:
+            f.write(peaks.tobytes())
+    return output_file
+
+
+def read_peaks(peaks_file):
+    """
+    Read a .peaks file.
+
+    Returns:
+        Dict with sample_rate, frames and levels [(frames_per_peak, peaks)]
+    """
+    data = Path(peaks_file).read_bytes()
+    magic, version, bits, level_count, sample_rate, frames = struct.unpack_from('<4sBBHII', data)
+    if magic != b'PEAK' or version != PEAKS_VERSION:
+        raise ValueError(f"Not a peaks file: {peaks_file}")
+
+    offset = struct.calcsize('<4sBBHII')
+    shapes = []
+    for _ in range(level_count):
+        shapes.append(struct.unpack_from('<II', data, offset))
+        offset += 8
+
+    levels = []
+    for frames_per_peak, count in shapes:
+        peaks = np.frombuffer(data, np.int8, count * 2, offset).reshape(count, 2)
+        levels.append((frames_per_peak, peaks))
+        offset += count * 2
+
+    return {'sample_rate': sample_rate, 'frames': frames, 'levels': levels}
+
+
+def main():
+    from pydub import AudioSegment
+
+    parser = argparse.ArgumentParser(
+        description='Write waveform peak files for existing clip WAVs'
+    )
+    parser.add_argument('files', nargs='+', help='WAV files')
+
+    args = parser.parse_args()
+
+    for wav_file in args.files:
+        output_file = write_peaks(AudioSegment.from_wav(wav_file), wav_file)
+        print(f"✓ {output_file} ({output_file.stat().st_size/1024:.1f}KB)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Command-line client for quote_server.py.
+Finds quotes and cuts clips using the server's warm transcripts and audio,
+so each request takes milliseconds instead of a full transcription.
+"""
+
+import argparse
+import json
+import os
+import urllib.error
+import urllib.request
+
+# Must match quote_server.py's defaults; not imported so the client stays
+# free of Whisper and pydub
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+def call(endpoint, payload=None, url=DEFAULT_URL):
+    """
+    Send a request to the quote server.
+
+    Args:
+        endpoint: Endpoint name, e.g. "find"
+        payload: JSON-serializable request body (None for a GET)
+        url: Base URL of the server
+
+    Returns:
+        Decoded JSON response
+    """
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(
+        f"{url}/{endpoint}",
+        data=data,
+        headers={'Content-Type': 'application/json'}
+    )
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(json.load(e).get('error', str(e)))
+    except urllib.error.URLError as e:
+        raise RuntimeError(f"Quote server not reachable at {url} ({e.reason}). "
+                           f"Start it with: python3 quote_server.py")
+
+
+def _file_arg(audio_file):
+    return os.path.abspath(audio_file) if audio_file else None
+
+
+def find_quote(quote, audio_file=None, threshold=85, speaker=None, url=DEFAULT_URL):
+    """Return the best match for a quote, or None."""
+    return call('find', {
+        'quote': quote,
+        'audio_file': _file_arg(audio_file),
+        'threshold': threshold,
+        'speaker': speaker
+    }, url)['match']
+
+
+def search(text, audio_file=None, url=DEFAULT_URL):
+    """Return transcript segments containing a phrase."""
+    return call('search', {'text': text, 'audio_file': _file_arg(audio_file)}, url)['results']
+
+
+def cut(audio_file, start_time, end_time, output_file, padding_ms=500, snap=False, url=DEFAULT_URL):
+    """Cut a time range (in seconds) from a recording into a WAV file."""
+    return call('cut', {
+        'audio_file': _file_arg(audio_file),
+        'start_time': start_time,
+        'end_time': end_time,
+        'output_file': os.path.abspath(output_file),
+        'padding_ms': padding_ms,
+        'snap': snap
+    }, url)
+
+
+def extract_quote(quote, output_file, audio_file=None, padding_ms=500, threshold=85, speaker=None,
+                  snap=False, url=DEFAULT_URL):
+    """
+    Find a quote and save it as a clip.
+
+    Returns:
+        Dictionary with 'match' and 'clip', or {'match': None} if not found
+    """
+    return call('extract', {
+        'quote': quote,
+        'output_file': os.path.abspath(output_file),
+        'audio_file': _file_arg(audio_file),
+        'padding_ms': padding_ms,
+        'threshold': threshold,
+        'speaker': speaker,
+        'snap': snap
+    }, url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find quotes and cut clips via the quote server')
+    parser.add_argument('--url', default=DEFAULT_URL, help=f'Server URL (default: {DEFAULT_URL})')
+    parser.add_argument('--file', help='Only search this audio file')
+    parser.add_argument('--speaker', help='Only match this speaker (Fireflies transcripts)')
+    parser.add_argument('--snap', action='store_true',
+                        help='Cut at the nearest quiet gap within the padding')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('status', help='Show loaded files')
+
+    find_parser = subparsers.add_parser('find', help='Find the timestamps of a quote')
+    find_parser.add_argument('quote')
+    find_parser.add_argument('--threshold', type=int, default=85)
+
+    search_parser = subparsers.add_parser('search', help='Search transcripts for a phrase')
+    search_parser.add_argument('text')
+
+    cut_parser = subparsers.add_parser('cut', help='Cut a time range into a WAV file')
+    cut_parser.add_argument('start', type=float, help='Start time in seconds')
+    cut_parser.add_argument('end', type=float, help='End time in seconds')
+    cut_parser.add_argument('output', help='Output WAV file')
+    cut_parser.add_argument('--padding', type=int, default=500)
+
+    extract_parser = subparsers.add_parser('extract', help='Find a quote and save it as a clip')
+    extract_parser.add_argument('quote')
+    extract_parser.add_argument('output', help='Output WAV file')
+    extract_parser.add_argument('--padding', type=int, default=500)
+    extract_parser.add_argument('--threshold', type=int, default=85)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'status':
+            for f in call('status', url=args.url)['files']:
+                print(f"{f['audio_file']}: {f['words']} words, audio {'loaded' if f['audio_loaded'] else 'not loaded'}")
+
+        elif args.command == 'find':
+            match = find_quote(args.quote, args.file, args.threshold, args.speaker, args.url)
+            if match:
+                print(f"✓ {match['audio_file']} [{match['start_time']:.1f}s - {match['end_time']:.1f}s] (score: {match['score']}%)")
+                print(f"  {match['matched_text']}")
+            else:
+                print("⚠️  Not found")
+
+        elif args.command == 'search':
+            results = search(args.text, args.file, args.url)
+            for r in results:
+                print(f"{r['audio_file']} [{r['start']:.1f}s - {r['end']:.1f}s] {r['text']}")
+            if not results:
+                print("No matches found.")
+
+        elif args.command == 'cut':
+            if not args.file:
+                parser.error("cut requires --file")
+            clip = cut(args.file, args.start, args.end, args.output, args.padding, args.snap, args.url)
+            print(f"✓ Saved: {clip['output_file']} ({clip['duration_ms']/1000:.1f}s)")
+
+        elif args.command == 'extract':
+            result = extract_quote(args.quote, args.output, args.file, args.padding, args.threshold,
+                                   args.speaker, args.snap, args.url)
+            if result['match']:
+                match = result['match']
+                print(f"✓ Found match (score: {match['score']}%)")
+                print(f"  Timestamp: {match['start_time']:.1f}s - {match['end_time']:.1f}s")
+                print(f"  Saved: {result['clip']['output_file']} ({result['clip']['duration_ms']/1000:.1f}s)")
+            else:
+                print("⚠️  Not found")
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
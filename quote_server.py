@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Local quote-search server.
+Keeps the Whisper transcripts, word indexes and memory-mapped audio of the
+interviews ready and answers "find this quote" and "cut this range"
+requests over HTTP on localhost. Use quote_client.py to talk to it.
+"""
+
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+from extract_clips import get_extractor
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class QuoteService:
+    def __init__(self, audio_files, model_size="base", preload_audio=True, transcript_source="whisper"):
+        """
+        Load every audio file's transcription and index up front.
+
+        Args:
+            audio_files: Paths to the interview recordings to serve
+            model_size: Whisper model size used for transcription
+            preload_audio: Decode all audio now rather than on the first cut
+            transcript_source: "whisper", "fireflies" or "auto"
+        """
+        self.extractors = {}
+
+        for audio_file in audio_files:
+            print(f"Preparing {audio_file}...")
+            extractor = get_extractor(audio_file, model_size=model_size, transcript_source=transcript_source)
+            if not extractor.transcription:
+                extractor.transcribe()
+            extractor.get_index()
+            if preload_audio and not extractor.audio:
+                extractor.load_audio()
+            self.extractors[os.path.abspath(str(audio_file))] = extractor
+
+    def _extractors_for(self, audio_file=None):
+        if audio_file is None:
+            return list(self.extractors.values())
+        path = os.path.abspath(audio_file)
+        if path not in self.extractors:
+            raise ValueError(f"Audio file not loaded: {audio_file}")
+        return [self.extractors[path]]
+
+    def status(self, request):
+        return {
+            'files': [
+                {
+                    'audio_file': e.audio_file,
+                    'words': len(e.get_index()),
+                    'audio_loaded': e.audio is not None
+                }
+                for e in self.extractors.values()
+            ]
+        }
+
+    def find(self, request):
+        """Best match for a quote across all (or one) of the loaded files."""
+        best_extractor = None
+        best_match = None
+
+        for extractor in self._extractors_for(request.get('audio_file')):
+            match = extractor.find_quote_timestamps(
+                request['quote'],
+                request.get('threshold', 85),
+                speaker=request.get('speaker')
+            )
+            if match and (best_match is None or match['score'] > best_match['score']):
+                best_extractor = extractor
+                best_match = match
+
+        if not best_match:
+            return {'match': None}
+
+        return {'match': dict(best_match, audio_file=best_extractor.audio_file)}
+
+    def search(self, request):
+        """Segments containing a phrase, like view_transcription.py --search."""
+        search_lower = request['text'].lower()
+        results = []
+
+        for extractor in self._extractors_for(request.get('audio_file')):
+            for segment in extractor.transcription['segments']:
+                if search_lower in segment['text'].lower():
+                    results.append({
+                        'audio_file': extractor.audio_file,
+                        'start': segment['start'],
+                        'end': segment['end'],
+                        'text': segment['text']
+                    })
+
+        return {'results': results}
+
+    def cut(self, request):
+        """Cut a time range from a loaded file and save it as a WAV."""
+        extractor = self._extractors_for(request['audio_file'])[0]
+        Path(request['output_file']).parent.mkdir(parents=True, exist_ok=True)
+
+        clip_info = extractor.extract_clip(
+            request['start_time'],
+            request['end_time'],
+            request['output_file'],
+            request.get('padding_ms', 500),
+            snap=request.get('snap', False)
+        )
+        return dict(clip_info, output_file=request['output_file'])
+
+    def extract(self, request):
+        """Find a quote and cut it in one request."""
+        match = self.find(request)['match']
+        if not match:
+            return {'match': None}
+
+        clip_info = self.cut({
+            'audio_file': match['audio_file'],
+            'start_time': match['start_time'],
+            'end_time': match['end_time'],
+            'output_file': request['output_file'],
+            'padding_ms': request.get('padding_ms', 500),
+            'snap': request.get('snap', False)
+        })
+        return {'match': match, 'clip': clip_info}
+
+
+def make_handler(service):
+    """Build a request handler class bound to a QuoteService."""
+
+    class QuoteRequestHandler(BaseHTTPRequestHandler):
+        routes = {
+            '/status': service.status,
+            '/find': service.find,
+            '/search': service.search,
+            '/cut': service.cut,
+            '/extract': service.extract,
+        }
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, request):
+            route = self.routes.get(self.path)
+            if route is None:
+                self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+                return
+            try:
+                self._send_json(200, route(request))
+            except (KeyError, ValueError) as e:
+                self._send_json(400, {'error': str(e)})
+            except Exception as e:
+                self._send_json(500, {'error': str(e)})
+
+        def do_GET(self):
+            self._handle({})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            try:
+                request = json.loads(self.rfile.read(length) or b'{}')
+            except json.JSONDecodeError as e:
+                self._send_json(400, {'error': f"Invalid JSON: {e}"})
+                return
+            self._handle(request)
+
+    return QuoteRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve quote search and clip cutting on localhost')
+    parser.add_argument('audio_files', nargs='*',
+                        help='Audio files to load (default: all .m4a files in audio/)')
+    parser.add_argument('--model', default='base',
+                        choices=['tiny', 'base', 'small', 'medium', 'large'],
+                        help='Whisper model size (default: base)')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Host (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--transcript', default='whisper', choices=['whisper', 'fireflies', 'auto'],
+                        help='Transcript source; auto uses a Fireflies export when one exists')
+    parser.add_argument('--lazy-audio', action='store_true',
+                        help='Decode audio on the first cut instead of at startup')
+
+    args = parser.parse_args()
+
+    audio_files = args.audio_files or sorted(str(p) for p in Path("audio").glob("*.m4a"))
+    if not audio_files:
+        print("Error: No audio files found in audio/ directory")
+        return 1
+
+    service = QuoteService(
+        audio_files,
+        model_size=args.model,
+        preload_audio=not args.lazy_audio,
+        transcript_source=args.transcript
+    )
+
+    # Requests are handled one at a time, so extractors need no locking
+    server = HTTPServer((args.host, args.port), make_handler(service))
+    print(f"\n✓ Quote server ready on http://{args.host}:{args.port} ({len(audio_files)} files)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
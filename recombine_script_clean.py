@@ -4,8 +4,11 @@ import os
 os.chdir('/Users/katiemuscarella/Projects/field/ads')
 
 from extract_clips import AudioClipExtractor
-from pydub import AudioSegment
-from pathlib import Path
+from concat_audio import concatenate_clips
+
+# Optional crossfade and silence between clips (milliseconds)
+CROSSFADE_MS = 0
+GAP_MS = 0
 
 # Script 6 clips from the script file
 script_6_quotes = [
@@ -24,7 +27,7 @@ extractor.transcribe()
 
 print("\nFinding clips without padding...\n")
 
-combined = None
+ranges = []
 
 for i, quote in enumerate(script_6_quotes, 1):
     print(f"Clip {i}: {quote[:60]}...")
@@ -36,27 +39,26 @@ for i, quote in enumerate(script_6_quotes, 1):
         # Extract without padding
         start_ms = int(match['start_time'] * 1000)
         end_ms = int(match['end_time'] * 1000)
+        ranges.append((start_ms, end_ms))
 
-        clip = extractor.audio[start_ms:end_ms]
-
-        if combined is None:
-            combined = clip
-        else:
-            combined += clip
-
-        print(f"  Added to combined audio ({len(clip)/1000:.1f}s)")
+        print(f"  Added to combined audio ({(end_ms - start_ms)/1000:.1f}s)")
     else:
         print(f"  ⚠️  Not found")
 
     print()
 
-if combined:
-    total_duration = len(combined) / 1000
-    print(f"Total combined duration: {total_duration:.1f}s ({total_duration/60:.1f} minutes)")
+output_file = "script_6/script_6_complete_clean.wav"
+result = concatenate_clips(
+    (extractor.audio[start_ms:end_ms] for start_ms, end_ms in ranges),
+    output_file,
+    crossfade_ms=CROSSFADE_MS,
+    gap_ms=GAP_MS
+)
 
-    output_file = "script_6/script_6_complete_clean.wav"
-    print(f"Exporting to: {output_file}")
-    combined.export(output_file, format="wav")
+if result:
+    total_duration = result['duration_ms'] / 1000
+    print(f"Total combined duration: {total_duration:.1f}s ({total_duration/60:.1f} minutes)")
+    print(f"Exported to: {output_file}")
 
     print(f"✅ Done! Created clean version without overlaps")
 else:
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Search a recording for quotes while it is being transcribed.
+The audio is decoded and transcribed ~30 seconds at a time, and every quote
+is matched against the newest part of the transcript, so each one is
+reported (and optionally cut) as soon as Whisper reaches it instead of after
+the whole file. Stops as soon as every quote has been found.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from audio_cache import load_audio_range, load_pcm_range
+from extract_clips import SCRIPTS, get_model
+from peaks import write_peaks
+from transcript_cache import TRANSCRIBE_OPTIONS, TranscriptCache
+from transcript_index import TranscriptIndex
+
+SAMPLE_RATE = 16000
+
+# Audio transcribed per step; each step ends at the quietest 50ms frame
+# within CUT_SEARCH_SECONDS of the nominal length
+STREAM_CHUNK_SECONDS = 30
+CUT_SEARCH_SECONDS = 3
+CUT_FRAME_MS = 50
+
+# A match is only reported once the transcript runs this far past it, so a
+# quote that continues into the next chunk isn't cut short
+SETTLE_SECONDS = 5
+
+# Each step only indexes the new segments plus this much of the transcript
+# before them, enough for a quote that spans a chunk boundary or is still
+# settling
+MATCH_OVERLAP_SECONDS = 60
+
+# Cache options for a streamed transcript. It is stitched from independent
+# chunks, so it is kept apart from full transcriptions rather than handed to
+# the other scripts in place of one
+STREAM_OPTIONS = dict(TRANSCRIBE_OPTIONS, stream=True)
+
+
+def quiet_cut(samples, nominal, search):
+    """Return the sample position of the quietest frame within search of nominal."""
+    frame_len = SAMPLE_RATE * CUT_FRAME_MS // 1000
+    lo = max(0, nominal - search)
+    count = (min(len(samples), nominal + search) - lo) // frame_len
+    if count <= 0:
+        return min(nominal, len(samples))
+    frames = samples[lo:lo + count * frame_len].reshape(count, frame_len)
+    return lo + int(np.argmin(np.mean(frames * frames, axis=1))) * frame_len + frame_len // 2
+
+
+def stream_transcribe(model, audio_file, **options):
+    """
+    Transcribe an audio file chunk by chunk.
+
+    Only the current chunk (plus a little lookahead to find a quiet cut) is
+    decoded at a time.
+
+    Args:
+        model: Loaded Whisper model
+        audio_file: Path to the audio file
+        **options: Passed to model.transcribe()
+
+    Yields:
+        (segments, decoded_until, finished, language) with segment and word
+        times on the original timeline, decoded_until in seconds and the
+        language Whisper detected for the chunk
+    """
+    position_ms = 0
+    lookahead_ms = (STREAM_CHUNK_SECONDS + CUT_SEARCH_SECONDS) * 1000
+
+    while True:
+        samples = load_pcm_range(audio_file, position_ms, position_ms + lookahead_ms)
+        finished = len(samples) < lookahead_ms * SAMPLE_RATE // 1000
+        cut = len(samples) if finished else quiet_cut(
+            samples, STREAM_CHUNK_SECONDS * SAMPLE_RATE, CUT_SEARCH_SECONDS * SAMPLE_RATE
+        )
+
+        offset = position_ms / 1000
+        segments = []
+        language = None
+        if cut:
+            result = model.transcribe(samples[:cut], **options)
+            language = result.get('language')
+            for segment in result['segments']:
+                segment = dict(
+                    segment,
+                    start=round(segment['start'] + offset, 3),
+                    end=round(segment['end'] + offset, 3)
+                )
+                if 'words' in segment:
+                    segment['words'] = [
+                        dict(w, start=round(w['start'] + offset, 3), end=round(w['end'] + offset, 3))
+                        for w in segment['words']
+                    ]
+                segments.append(segment)
+
+        position_ms += cut * 1000 // SAMPLE_RATE
+        yield segments, position_ms / 1000, finished, language
+        if finished:
+            return
+
+
+class StreamMatcher:
+    def __init__(self, quotes, threshold=85):
+        """
+        Match quotes against a transcript that grows over time.
+
+        Args:
+            quotes: Quotes to look for
+            threshold: Minimum alignment score (0-100)
+        """
+        self.threshold = threshold
+        self.pending = list(dict.fromkeys(quotes))
+        self.found = {}
+        self.segments = []
+        self.language = None
+        self.decoded_until = 0
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def add(self, segments, decoded_until, finished=False, language=None):
+        """
+        Add newly transcribed segments and match the quotes not found yet.
+
+        Args:
+            segments: New segments, in order
+            decoded_until: How far (seconds) the transcript now reaches
+            finished: True for the last segments of the recording
+            language: Language Whisper detected for these segments
+
+        Returns:
+            List of (quote, match) pairs found by this call
+        """
+        for segment in segments:
+            self.segments.append(dict(segment, id=len(self.segments)))
+        self.language = self.language or language
+
+        # Only the new segments and the overlap before them are indexed, so
+        # each step costs the same however long the transcript has grown
+        window_start = self.decoded_until - MATCH_OVERLAP_SECONDS
+        self.decoded_until = decoded_until
+        first = len(self.segments)
+        while first > 0 and self.segments[first - 1]['end'] > window_start:
+            first -= 1
+
+        if not self.pending or first == len(self.segments):
+            return []
+
+        index = TranscriptIndex({'segments': self.segments[first:]})
+        matches = index.find_many(self.pending, self.threshold)
+        newly_found = []
+
+        for quote in list(self.pending):
+            match = matches[quote]
+            if match and (finished or match['end_time'] <= decoded_until - SETTLE_SECONDS):
+                self.pending.remove(quote)
+                self.found[quote] = match
+                newly_found.append((quote, match))
+
+        return newly_found
+
+    def transcription(self):
+        """The transcript so far, as a Whisper result dictionary."""
+        return {
+            'text': ''.join(s['text'] for s in self.segments),
+            'segments': self.segments,
+            'language': self.language
+        }
+
+
+def stream_search(audio_file, quotes, model_size="base", threshold=85, stop_early=True, use_cache=True):
+    """
+    Find quotes in a recording, reporting each as soon as it is transcribed.
+
+    A cached full transcription (or an earlier stream) is used directly if
+    there is one. A stream that runs to the end of the file is cached under
+    STREAM_OPTIONS.
+
+    Yields:
+        (quote, match, decoded_until) for each quote as it is found, then
+        (quote, None, decoded_until) for any quote never found
+    """
+    matcher = StreamMatcher(quotes, threshold)
+    cache = TranscriptCache() if use_cache else None
+
+    cached = None
+    if cache:
+        cached = (cache.get(audio_file, model_size, TRANSCRIBE_OPTIONS)
+                  or cache.get(audio_file, model_size, STREAM_OPTIONS))
+    if cached is not None:
+        print(f"✓ Loaded cached transcription for {audio_file}")
+        end = cached['segments'][-1]['end'] if cached['segments'] else 0
+        for quote, match in matcher.add(cached['segments'], end, finished=True,
+                                        language=cached.get('language')):
+            yield quote, match, end
+    else:
+        model = get_model(model_size)
+        end = 0
+        for segments, end, finished, language in stream_transcribe(model, audio_file, word_timestamps=True,
+                                                                    verbose=False):
+            print(f"  ...transcribed to {end/60:.1f} min")
+            for quote, match in matcher.add(segments, end, finished, language):
+                yield quote, match, end
+
+            if finished and cache:
+                cache.put(audio_file, model_size, STREAM_OPTIONS, matcher.transcription())
+            if stop_early and matcher.done:
+                return
+
+    for quote in matcher.pending:
+        yield quote, None, end
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find quotes in a recording while it is being transcribed'
+    )
+    parser.add_argument('audio_file', help='Path to the audio file')
+    parser.add_argument('quotes', nargs='*', help='Quotes to look for')
+    parser.add_argument('--script', choices=list(SCRIPTS.keys()),
+                        help="Also look for every quote in this script")
+    parser.add_argument('--threshold', type=int, default=85,
+                        help='Minimum match score (default: 85)')
+    parser.add_argument('--model', default='base',
+                        choices=['tiny', 'base', 'small', 'medium', 'large'],
+                        help='Whisper model size (default: base)')
+    parser.add_argument('--extract-dir',
+                        help='Cut each quote into this directory as soon as it is found')
+    parser.add_argument('--padding', type=int, default=500,
+                        help='Padding in milliseconds for extracted clips (default: 500)')
+    parser.add_argument('--keep-going', action='store_true',
+                        help='Transcribe the whole file even after every quote is found')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the transcript cache')
+
+    args = parser.parse_args()
+
+    quotes = list(args.quotes) + (SCRIPTS[args.script] if args.script else [])
+    if not quotes:
+        parser.error("give at least one quote or --script")
+
+    if args.extract_dir:
+        Path(args.extract_dir).mkdir(parents=True, exist_ok=True)
+
+    found = 0
+    for quote, match, decoded_until in stream_search(
+        args.audio_file,
+        quotes,
+        model_size=args.model,
+        threshold=args.threshold,
+        stop_early=not args.keep_going,
+        use_cache=not args.no_cache
+    ):
+        if not match:
+            print(f"⚠️  Not found: {quote[:60]}...")
+            continue
+
+        found += 1
+        print(f"✓ Found after {decoded_until/60:.1f} min (score: {match['score']}%): {quote[:60]}...")
+        print(f"  [{match['start_time']:.1f}s - {match['end_time']:.1f}s] {match['matched_text'][:60]}...")
+
+        if args.extract_dir:
+            start_ms = max(0, int(match['start_time'] * 1000) - args.padding)
+            end_ms = int(match['end_time'] * 1000) + args.padding
+            output_file = Path(args.extract_dir) / f"quote_{quotes.index(quote) + 1:02d}.wav"
+            clip = load_audio_range(args.audio_file, start_ms, end_ms)
+            clip.export(output_file, format="wav")
+            write_peaks(clip, output_file)
+            print(f"  Saved: {output_file}")
+
+    print(f"\nFound {found}/{len(dict.fromkeys(quotes))} quotes")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
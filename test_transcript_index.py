@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Regression tests for quote alignment, against the Fireflies transcripts.
+
+Run with: python3 -m pytest test_transcript_index.py
+"""
+
+from pathlib import Path
+
+from fireflies import load_fireflies_transcript
+from transcript_index import TranscriptIndex
+
+ATWOOD_JSON = Path(__file__).parent / "Atwood-Rd_2025-11-07T20-58-43-655Z.json"
+
+
+def atwood_index(speaker=None):
+    return TranscriptIndex(load_fireflies_transcript(ATWOOD_JSON), speaker=speaker)
+
+
+def test_paraphrased_start_keeps_first_words():
+    # The transcript says "I think the more you cook with it"; the match must
+    # still start on "I think", not at "with it" where the words agree again
+    quote = ("I think by cooking with it, I've noticed that the seasoning gets darker "
+             "and it's building more and more layers, and it's getting even more nonstick.")
+    match = atwood_index().find_alignment(quote)
+
+    assert match is not None
+    assert match['start_time'] == 1305.67
+    assert match['end_time'] == 1313.322
+    assert match['matched_text'].startswith("I think the more you cook with it")
+
+
+def test_missing_end_words_keep_the_match():
+    # The quote's last words were written for the ad and aren't in the
+    # transcript; the match is still found and ends on the last quote word
+    # the transcript has, not on the unrelated words that follow it
+    quote = "Cast iron is kind of a gateway drug to the more intentional... a life worth living."
+    match = atwood_index().find_alignment(quote)
+
+    assert match is not None
+    assert match['score'] >= 85
+    assert match['start_time'] == 343.491
+    assert match['end_time'] == 347.54
+    assert match['matched_text'].endswith("to the more intentional.")
+
+
+def test_exact_quote_scores_100():
+    quote = "I make a fried egg almost every day now."
+    match = atwood_index(speaker="matt").find_alignment(quote)
+
+    assert match is not None
+    assert match['score'] == 100
+    assert match['start_time'] == 627.72
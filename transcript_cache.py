@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for Whisper transcriptions.
+Transcripts are keyed by the audio content hash, model size and decoding
+options, so each recording only has to be transcribed once.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = ".transcript_cache"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024  # 500 MB
+
+# Options every script passes to model.transcribe()
+TRANSCRIBE_OPTIONS = {"word_timestamps": True}
+
+
+def transcribe_options(vad=False, workers=1):
+    """
+    Cache options for a transcription made with these settings.
+
+    VAD and chunked (workers > 1) transcriptions differ from a single pass
+    over the whole file, so each is cached under its own key. With both,
+    VAD wins: the speech is transcribed in one process.
+    """
+    if vad:
+        return dict(TRANSCRIBE_OPTIONS, vad=True)
+    if workers > 1:
+        return dict(TRANSCRIBE_OPTIONS, chunked=True)
+    return TRANSCRIBE_OPTIONS
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Hash a file's contents in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached transcripts and the index
+            max_bytes: Total size cap; least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.index_path = self.cache_dir / "index.json"
+        self._index = None
+
+    def _load_index(self):
+        if self._index is None:
+            if self.index_path.exists():
+                with open(self.index_path, 'r') as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {"entries": {}, "hashes": {}}
+        return self._index
+
+    def _save_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def content_hash(self, audio_file):
+        """
+        Return the SHA-256 of an audio file.
+
+        The hash is remembered per path along with the file's size and mtime,
+        so unchanged files are not re-read and changed files are re-hashed.
+        """
+        index = self._load_index()
+        path = os.path.abspath(audio_file)
+        stat = os.stat(path)
+
+        known = index["hashes"].get(path)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["sha256"]
+
+        sha256 = file_sha256(path)
+        index["hashes"][path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256
+        }
+        self._save_index()
+        return sha256
+
+    def key(self, audio_file, model_size, options=None):
+        """Build the cache key for an audio file, model and decoding options."""
+        key_data = {
+            "audio_sha256": self.content_hash(audio_file),
+            "model": model_size,
+            "options": options or {}
+        }
+        encoded = json.dumps(key_data, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def _fingerprint_path(self, key):
+        return self.cache_dir / f"{key}.envelope.npy"
+
+    def get(self, audio_file, model_size, options=None):
+        """
+        Look up a cached transcription.
+
+        Returns:
+            The Whisper result dictionary, or None on a cache miss
+        """
+        index = self._load_index()
+        key = self.key(audio_file, model_size, options)
+        entry_path = self._entry_path(key)
+
+        if key not in index["entries"] or not entry_path.exists():
+            return None
+
+        with open(entry_path, 'r') as f:
+            result = json.load(f)
+
+        index["entries"][key]["last_access"] = time.time()
+        self._save_index()
+        return result
+
+    def put(self, audio_file, model_size, options, result, fingerprint=None):
+        """
+        Store a transcription and evict old entries if over the size cap.
+
+        Args:
+            fingerprint: Optional energy envelope of the audio, kept so a later
+                version of the recording can reuse this transcription
+        """
+        index = self._load_index()
+        key = self.key(audio_file, model_size, options)
+        entry_path = self._entry_path(key)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, entry_path)
+
+        size = entry_path.stat().st_size
+        if fingerprint is not None:
+            np.save(self._fingerprint_path(key), fingerprint)
+            size += self._fingerprint_path(key).stat().st_size
+
+        index["entries"][key] = {
+            "source_file": str(audio_file),
+            "model": model_size,
+            "options": options or {},
+            "size": size,
+            "fingerprint": fingerprint is not None,
+            "last_access": time.time()
+        }
+        self.evict(keep=key)
+        self._save_index()
+
+    def previous_version(self, audio_file, model_size, options=None):
+        """
+        Find the most recent transcription of an earlier version of a file.
+
+        Only entries for the same path, model and options that were stored
+        with a fingerprint are considered.
+
+        Returns:
+            (result, fingerprint) or None
+        """
+        entries = self._load_index()["entries"]
+        current = self.key(audio_file, model_size, options)
+        path = os.path.abspath(audio_file)
+
+        candidates = [
+            key for key, entry in entries.items()
+            if key != current
+            and entry.get("fingerprint")
+            and os.path.abspath(entry["source_file"]) == path
+            and entry["model"] == model_size
+            and entry["options"] == (options or {})
+            and self._entry_path(key).exists()
+            and self._fingerprint_path(key).exists()
+        ]
+        if not candidates:
+            return None
+
+        key = max(candidates, key=lambda k: entries[k]["last_access"])
+        with open(self._entry_path(key), 'r') as f:
+            result = json.load(f)
+        return result, np.load(self._fingerprint_path(key))
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = self._load_index()["entries"]
+        total = sum(e["size"] for e in entries.values())
+
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries[key]["size"]
+            self._entry_path(key).unlink(missing_ok=True)
+            self._fingerprint_path(key).unlink(missing_ok=True)
+            del entries[key]
+
+
+def cached_transcribe(audio_file, model_size, transcribe_fn, options=None,
+                      use_cache=True, refresh=False, cache=None, transcribe_range_fn=None):
+    """
+    Return the transcription for an audio file, using the cache when possible.
+
+    Args:
+        audio_file: Path to the audio file
+        model_size: Whisper model size (part of the cache key)
+        transcribe_fn: Callable that runs Whisper and returns its result
+        options: Decoding options (part of the cache key)
+        use_cache: If False, skip the cache entirely
+        refresh: If True, ignore any cached copy and overwrite it
+        cache: TranscriptCache instance (default: .transcript_cache/)
+        transcribe_range_fn: Optional callable(start_seconds, end_seconds)
+            that transcribes part of the file. If given, a changed recording
+            reuses the transcription of its previous version and only the
+            changed spans are transcribed. The file is then decoded once, for
+            its fingerprint, and those samples are passed to transcribe_fn
+            for a full transcription
+
+    Returns:
+        Whisper result dictionary with 'text' and 'segments'
+    """
+    if options is None:
+        options = TRANSCRIBE_OPTIONS
+
+    if not use_cache:
+        return transcribe_fn()
+
+    cache = cache or TranscriptCache()
+
+    if not refresh:
+        result = cache.get(audio_file, model_size, options)
+        if result is not None:
+            print(f"✓ Loaded cached transcription for {audio_file}")
+            return result
+
+    if transcribe_range_fn is None:
+        result = transcribe_fn()
+        cache.put(audio_file, model_size, options, result)
+        return result
+
+    import whisper
+    from incremental_transcribe import energy_envelope, retranscribe_changes
+
+    # Every version is stored with its fingerprint so the next upload can be
+    # compared with it; the decode is shared with a full transcription
+    samples = whisper.load_audio(str(audio_file))
+    fingerprint = energy_envelope(samples)
+    result = None
+    previous = None if refresh else cache.previous_version(audio_file, model_size, options)
+    if previous is not None:
+        print(f"Found a transcription of an earlier version of {audio_file}")
+        old_result, old_fingerprint = previous
+        result = retranscribe_changes(old_result, old_fingerprint, fingerprint, transcribe_range_fn)
+        if result is None:
+            print("⚠️  Recording changed completely, transcribing from scratch")
+
+    if result is None:
+        result = transcribe_fn(samples)
+    cache.put(audio_file, model_size, options, result, fingerprint=fingerprint)
+    return result
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Word n-gram index over a Whisper transcription.
+Seeds candidate regions for quote matching from shared phrases, then aligns
+the quote to each region word by word with a banded semi-global alignment,
+so a match starts and ends on exact transcript words and covers the whole
+quote.
+
+Words are stored as parallel NumPy arrays (interned token ids, float32
+start/end times and segment numbers) rather than Whisper's nested dicts.
+"""
+
+import re
+
+import numpy as np
+from fuzzywuzzy import fuzz
+
+# Longest shingle used for seeding; shorter ones are tried if it finds nothing
+NGRAM_SIZE = 3
+
+# Number of top-voted alignments to score, and how far around each to look
+MAX_SEEDS = 5
+SEED_SLACK = 5
+
+# How far (in words) an alignment may drift from the seeded diagonal
+ALIGN_BAND = 10
+
+# Alignment scores: words at least WORD_SIMILARITY alike count as a match
+# worth up to MATCH_SCORE; anything else is a mismatch
+WORD_SIMILARITY = 0.75
+MATCH_SCORE = 1.0
+MISMATCH_SCORE = -1.0
+GAP_SCORE = -1.0
+
+# Most unmatched transcript words between a lone matched word at either end
+# of an alignment and the rest of the match
+END_GAP = 4
+
+
+def normalize_word(word):
+    """Lowercase a word and strip punctuation for indexing."""
+    return re.sub(r"[^\w']+", "", word.lower())
+
+
+def tokenize(text):
+    """Split text into normalized index tokens."""
+    return [t for t in (normalize_word(w) for w in text.split()) if t]
+
+
+def has_speakers(segments):
+    """Return True if the segments carry speaker labels (e.g. Fireflies)."""
+    return any(s.get('speaker') for s in segments)
+
+
+def _seconds(value):
+    """Convert a float32 timestamp back to the millisecond value it stores."""
+    return round(float(value), 3)
+
+
+def filter_segments(segments, speaker=None):
+    """
+    Keep only the segments spoken by one speaker.
+
+    Transcripts without speaker labels (Whisper) are returned unchanged.
+
+    Args:
+        segments: Transcript segments
+        speaker: Speaker name to keep (case-insensitive), or None for all
+    """
+    if not speaker or not has_speakers(segments):
+        return segments
+    speaker = speaker.lower()
+    return [s for s in segments if (s.get('speaker') or '').lower() == speaker]
+
+
+class TranscriptIndex:
+    def __init__(self, transcription, ngram_size=NGRAM_SIZE, speaker=None):
+        """
+        Build the index.
+
+        Args:
+            transcription: Whisper result dictionary with word timestamps
+            ngram_size: Longest word n-gram to index
+            speaker: Only index this speaker's segments (if the transcript
+                has speaker labels); other turns are skipped entirely
+        """
+        self.transcription = transcription
+        self.ngram_size = ngram_size
+        self.speaker = speaker
+        self.segments = filter_segments(transcription['segments'], speaker)
+
+        # Position of each kept segment in the full transcript, so turns
+        # skipped by the speaker filter can be found
+        positions = {id(segment): n for n, segment in enumerate(transcription['segments'])}
+
+        # Flatten words with timestamps from segments into parallel arrays
+        self.word_texts = []
+        self.vocab = {}
+        token_ids = []
+        starts = []
+        ends = []
+        segment_ids = []
+        turn_breaks = []
+        previous = None
+        skipped = False
+        for segment_id, segment in enumerate(self.segments):
+            position = positions[id(segment)]
+            skipped = skipped or (previous is not None and position > previous + 1)
+            previous = position
+            for word in segment.get('words', ()):
+                turn_breaks.append(skipped and bool(token_ids))
+                skipped = False
+                text = word['word'].strip()
+                self.word_texts.append(text)
+                token_ids.append(self.vocab.setdefault(normalize_word(text), len(self.vocab)))
+                starts.append(word['start'])
+                ends.append(word['end'])
+                segment_ids.append(segment_id)
+
+        self.token_ids = np.array(token_ids, dtype=np.int32)
+        self.starts = np.array(starts, dtype=np.float32)
+        self.ends = np.array(ends, dtype=np.float32)
+        self.segment_ids = np.array(segment_ids, dtype=np.int32)
+        # True where a word follows a turn the speaker filter skipped
+        self.turn_breaks = np.array(turn_breaks, dtype=bool)
+
+        # n-gram keys in sorted order, with the word offset each one starts at
+        # (offsets ascend within equal keys, like a scan of the transcript)
+        self.ngram_keys = {}
+        self.ngram_positions = {}
+        for n in range(1, ngram_size + 1):
+            keys, _ = self._ngram_keys(self.token_ids, n)
+            order = np.argsort(keys, kind='stable')
+            self.ngram_keys[n] = keys[order]
+            self.ngram_positions[n] = order
+
+        # Token id -> normalized word, and word pair -> similarity, shared by
+        # every quote aligned against this index
+        self.vocab_words = list(self.vocab)
+        self.alphabet = {c: k for k, c in enumerate(sorted(set(''.join(self.vocab_words))))}
+        self.vocab_letters = self.letter_counts(self.vocab_words)
+        self.similarities = {}
+
+    def __len__(self):
+        return len(self.token_ids)
+
+    def token_ids_for(self, tokens):
+        """Map normalized tokens to vocabulary ids (-1 for unknown words)."""
+        return np.array([self.vocab.get(t, -1) for t in tokens], dtype=np.int64)
+
+    def _ngram_keys(self, ids, n):
+        """
+        Encode every n-gram of a token id array as one integer.
+
+        Returns:
+            (keys, valid) arrays; an n-gram is invalid if it has an unknown word
+        """
+        count = len(ids) - n + 1
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+        ids = ids.astype(np.int64)
+        base = max(len(self.vocab), 1)
+        keys = ids[:count].copy()
+        valid = ids[:count] >= 0
+        for k in range(1, n):
+            keys = keys * base + ids[k:k + count]
+            valid &= ids[k:k + count] >= 0
+        return keys, valid
+
+    def seed_many(self, quote_token_lists, max_seeds=MAX_SEEDS):
+        """
+        Vote for window start offsets for many quotes in one pass.
+
+        Each shared n-gram at quote offset q and transcript offset p votes for
+        a window starting at p - q. The n-grams of every quote are looked up
+        together, and a quote falls back to shorter n-grams only when none of
+        its longer ones are found.
+
+        Args:
+            quote_token_lists: Normalized words of each quote
+
+        Returns:
+            One list per quote of its top-voted start offsets (ties go to the
+            alignment voted for first)
+        """
+        quote_ids = [self.token_ids_for(tokens) for tokens in quote_token_lists]
+        seeds = [[] for _ in quote_ids]
+        pending = list(range(len(quote_ids)))
+        longest = max((len(ids) for ids in quote_ids), default=0)
+
+        for n in range(min(self.ngram_size, longest), 0, -1):
+            batch = [k for k in pending if len(quote_ids[k]) >= n]
+            if not batch:
+                continue
+
+            encoded = [self._ngram_keys(quote_ids[k], n) for k in batch]
+            quote_keys = np.concatenate([keys for keys, _ in encoded])
+            valid = np.concatenate([v for _, v in encoded])
+            owners = np.repeat(np.arange(len(batch)), [len(keys) for keys, _ in encoded])
+            offsets_in_quote = np.concatenate([np.arange(len(keys)) for keys, _ in encoded])
+
+            # Range of transcript occurrences for each quote n-gram
+            keys = self.ngram_keys[n]
+            lo = np.searchsorted(keys, quote_keys, side='left')
+            hi = np.searchsorted(keys, quote_keys, side='right')
+            counts = np.where(valid, hi - lo, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            # Expand to one (quote, q, p) vote each, in quote, q then p order
+            rows = np.repeat(np.arange(len(quote_keys)), counts)
+            first = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+            p = self.ngram_positions[n][first + np.arange(total)]
+            starts = p - offsets_in_quote[rows]
+
+            # Count votes per (quote, start) pair, encoded as one integer
+            stride = len(self.token_ids) + longest + 1
+            pairs, first_vote, votes = np.unique(
+                owners[rows] * stride + starts + longest, return_index=True, return_counts=True
+            )
+            pair_owners = pairs // stride
+            order = np.lexsort((first_vote, -votes, pair_owners))
+            ranked_owners = pair_owners[order]
+            ranked_starts = pairs[order] % stride - longest
+
+            bounds = np.searchsorted(ranked_owners, np.arange(len(batch) + 1))
+            for b, k in enumerate(batch):
+                top = ranked_starts[bounds[b]:min(bounds[b + 1], bounds[b] + max_seeds)]
+                seeds[k] = [int(start) for start in top]
+            pending = [k for k in pending if not seeds[k]]
+
+        return seeds
+
+    def seed_starts(self, quote_tokens, max_seeds=MAX_SEEDS):
+        """Top-voted window start offsets for one quote (see seed_many())."""
+        return self.seed_many([quote_tokens], max_seeds)[0]
+
+    def window(self, start, size):
+        """
+        Return zero-copy views of a word window.
+
+        Returns:
+            Dictionary of token_ids, starts, ends and segment_ids array views
+        """
+        end = start + size
+        return {
+            'token_ids': self.token_ids[start:end],
+            'starts': self.starts[start:end],
+            'ends': self.ends[start:end],
+            'segment_ids': self.segment_ids[start:end]
+        }
+
+    def similarity(self, a, b):
+        """
+        Return how alike two normalized words are (0-1).
+
+        Identical words score 1; near spellings ("nonstick"/"non-stick") score
+        their fuzz.ratio; anything below WORD_SIMILARITY scores 0.
+        """
+        if a == b:
+            return 1.0
+        key = (a, b)
+        value = self.similarities.get(key)
+        if value is None:
+            value = fuzz.ratio(a, b) / 100
+            if value < WORD_SIMILARITY:
+                value = 0.0
+            self.similarities[key] = value
+        return value
+
+    def letter_counts(self, words):
+        """Count each word's letters as a (words, alphabet) array."""
+        counts = np.zeros((len(words), len(self.alphabet)), dtype=np.int16)
+        for row, word in enumerate(words):
+            for c in word:
+                if c in self.alphabet:
+                    counts[row, self.alphabet[c]] += 1
+        return counts
+
+    def similarity_table(self, quote_tokens, token_ids):
+        """
+        Similarities between quote words and transcript words, as an array.
+
+        Exact matches are found by comparing token ids. fuzz.ratio is only
+        run on the word pairs whose shared letters are enough for it to reach
+        WORD_SIMILARITY, so most of the table never leaves NumPy.
+
+        Args:
+            quote_tokens: Normalized quote words (may repeat)
+            token_ids: Transcript token ids to compare them with
+
+        Returns:
+            (table, columns): table[i, c] is the similarity of quote_tokens[i]
+            to the word with token id columns[c]; columns are sorted
+        """
+        columns = np.unique(np.asarray(token_ids, dtype=np.int64))
+        words = sorted(set(quote_tokens))
+        rows = np.array([words.index(t) for t in quote_tokens], dtype=np.int64)
+
+        word_ids = self.token_ids_for(words)
+        table = (word_ids[:, None] == columns[None, :]).astype(np.float32)
+
+        # fuzz.ratio is at most twice the shared letters over both lengths
+        # (before rounding to a whole percent)
+        word_letters = self.letter_counts(words)
+        column_letters = self.vocab_letters[columns]
+        shared = np.minimum(word_letters[:, None, :], column_letters[None, :, :]).sum(axis=2)
+        lengths = np.array([len(w) for w in words])[:, None] + column_letters.sum(axis=1)[None, :]
+        candidates = (table == 0) & (2 * shared >= (WORD_SIMILARITY - 0.005) * lengths)
+        for w, c in zip(*np.nonzero(candidates)):
+            table[w, c] = self.similarity(words[w], self.vocab_words[columns[c]])
+
+        return table[rows], columns
+
+    def align(self, quote_tokens, region_start, region_end, band=ALIGN_BAND, offset=0,
+              similarities=None):
+        """
+        Align every word of a quote to part of a region of the transcript.
+
+        Banded semi-global alignment: the quote may start and end anywhere
+        in the region, but each of its words is either aligned to a region
+        word (a match or a mismatch) or counted as a gap, so an alignment
+        can't stop short of quote words because a paraphrase separates them
+        from the rest. Only cells within `band` words of the
+        diagonal region word = quote word + offset are filled, so the cost is
+        O(len(quote) * band). Each quote word's row is filled with array
+        operations; runs of skipped region words are a running maximum.
+
+        Args:
+            quote_tokens: Normalized quote words
+            region_start: First transcript word of the region
+            region_end: End (exclusive) of the region
+            band: Maximum drift from the diagonal, in words
+            offset: Region word expected to align with the first quote word
+            similarities: (table, columns) from similarity_table() covering
+                the quote and region, to share one table between alignments
+
+        Returns:
+            Dictionary with first_word and last_word (transcript indices),
+            confidence (one 0-1 value per quote word) and score (0-100), or
+            None if no words align
+        """
+        region_ids = self.token_ids[region_start:region_end]
+        table, columns = similarities or self.similarity_table(quote_tokens, region_ids)
+        sim = table[:, np.searchsorted(columns, region_ids)]
+        m, r = sim.shape
+        if not r or not sim.any():
+            return None
+
+        steps = np.where(sim > 0, MATCH_SCORE * (2 * sim - 1), MISMATCH_SCORE)
+
+        # H[i, j]: best alignment of the first i quote words ending at region
+        # word j. Row 0 is free (the quote may start at any region word) and
+        # column 0 is quote words with nothing before them to align to.
+        # Cells outside the band can't be reached.
+        H = np.full((m + 1, r + 1), -np.inf)
+        H[0] = 0.0
+        H[:, 0] = GAP_SCORE * np.arange(m + 1)
+        gaps = GAP_SCORE * np.arange(r + 1)
+        for i in range(1, m + 1):
+            # Past either end of the region the band stays on its edge, so
+            # the remaining quote words can still be counted as gaps
+            centre = min(max(i - 1 + offset, 0), r)
+            lo, hi = max(1, centre - band + 1), min(r, centre + band + 1)
+            diagonal = H[i - 1, lo - 1:hi] + steps[i - 1, lo - 1:hi]
+            up = H[i - 1, lo:hi + 1] + GAP_SCORE
+            cells = np.maximum(diagonal, up)
+            # row[j] = max over k <= j of cells[k] + GAP_SCORE * (j - k)
+            left = np.maximum.accumulate(cells - gaps[lo:hi + 1]) + gaps[lo:hi + 1]
+            H[i, lo:hi + 1] = np.round(np.maximum(cells, left), 9)
+
+        # Of equally good ends, take the last, so a final quote word that
+        # could be a mismatch or a gap keeps its transcript word
+        j = int(np.flatnonzero(H[m] >= H[m].max() - 1e-6)[-1])
+        i = m
+
+        # Trace back to the first quote word, preferring aligned pairs, and
+        # collect the region words the quote words were aligned to
+        confidence = [0.0] * m
+        aligned = []
+        while i > 0:
+            if j > 0 and abs(H[i, j] - (H[i - 1, j - 1] + steps[i - 1, j - 1])) < 1e-6:
+                confidence[i - 1] = float(sim[i - 1, j - 1])
+                aligned.append((i - 1, j - 1))
+                i, j = i - 1, j - 1
+            elif abs(H[i, j] - (H[i - 1, j] + GAP_SCORE)) < 1e-6:
+                i -= 1
+            else:
+                j -= 1
+
+        if not any(confidence):
+            return None
+
+        # The match runs between the first and last pair of consecutive
+        # aligned words. A lone aligned word is added at either end only if
+        # it is within END_GAP words, so a quote's first word survives being
+        # followed by a paraphrase, but a chance match at the end of a run of
+        # words the transcript doesn't have is not
+        hits = [j for q, j in reversed(aligned) if confidence[q]]
+        pairs = [k for k in range(len(hits) - 1) if hits[k + 1] == hits[k] + 1]
+        lo, hi = (pairs[0], pairs[-1] + 1) if pairs else (0, len(hits) - 1)
+        while lo > 0 and hits[lo] - hits[lo - 1] <= END_GAP + 1:
+            lo -= 1
+        while hi < len(hits) - 1 and hits[hi + 1] - hits[hi] <= END_GAP + 1:
+            hi += 1
+        first, last = hits[lo], hits[hi]
+
+        # Scored like the old sliding window, with fuzz.ratio over the
+        # letters, so a paraphrased word still earns the letters it shares
+        matched = [self.vocab_words[t] for t in region_ids[first:last + 1]]
+        return {
+            'first_word': region_start + first,
+            'last_word': region_start + last,
+            'confidence': confidence,
+            'score': fuzz.ratio(' '.join(quote_tokens), ' '.join(matched))
+        }
+
+    def _match(self, alignment):
+        """Add times and the matched text to an alignment."""
+        first, last = alignment['first_word'], alignment['last_word']
+        view = self.window(first, last - first + 1)
+        return dict(
+            alignment,
+            start_time=_seconds(view['starts'][0]),
+            end_time=_seconds(view['ends'][-1]),
+            matched_text=' '.join(self.word_texts[first:last + 1])
+        )
+
+    def find_alignment(self, quote_text, threshold=85, max_seeds=MAX_SEEDS, slack=SEED_SLACK,
+                       band=ALIGN_BAND):
+        """
+        Find the best word-level alignment of a quote.
+
+        Returns:
+            Dictionary with start_time, end_time, matched_text, score,
+            first_word, last_word and per-word confidence, or None if no
+            alignment reaches the threshold
+        """
+        return self.find_many([quote_text], threshold, max_seeds, slack, band)[quote_text]
+
+    def find_many(self, quotes, threshold=85, max_seeds=MAX_SEEDS, slack=SEED_SLACK,
+                  band=ALIGN_BAND):
+        """
+        Find the best word-level alignment for each of many quotes.
+
+        Candidate regions for every quote are seeded in one batched n-gram
+        lookup (see seed_many()) before any are aligned. Each seeded start
+        offset is widened by `slack` words on both sides and the quote is
+        aligned within it. Every quote word is aligned, so the match runs
+        from the first to the last transcript word the quote's words were
+        matched to, and it is scored with fuzz.ratio between the quote and
+        those words.
+
+        Args:
+            quotes: Iterable of quote strings (repeats are aligned once)
+            threshold: Minimum similarity score (0-100)
+
+        Returns:
+            Dictionary mapping each quote to its match (see find_alignment()),
+            or None if no alignment reaches the threshold
+        """
+        quotes = list(dict.fromkeys(quotes))
+        quote_tokens = [tokenize(quote) for quote in quotes]
+        seeds = self.seed_many(quote_tokens, max_seeds)
+
+        # Every candidate region, in ascending order per quote so the earliest
+        # region wins ties. A region is split where the speaker filter skipped
+        # a turn, so an alignment never runs across someone else's words.
+        regions = []
+        for k, (tokens, quote_seeds) in enumerate(zip(quote_tokens, seeds)):
+            for seed in sorted(set(quote_seeds)):
+                region_start = max(0, seed - slack)
+                region_end = min(len(self.token_ids), seed + len(tokens) + slack)
+                breaks = region_start + 1 + np.flatnonzero(self.turn_breaks[region_start + 1:region_end])
+                bounds = [region_start] + [int(b) for b in breaks] + [region_end]
+                for start, end in zip(bounds, bounds[1:]):
+                    regions.append((k, start, end, seed - start))
+
+        # One similarity table per quote over all its candidate regions,
+        # shared by those alignments
+        tables = {}
+        for k in dict.fromkeys(k for k, _, _, _ in regions):
+            region_ids = [self.token_ids[start:end] for q, start, end, _ in regions if q == k]
+            tables[k] = self.similarity_table(quote_tokens[k], np.concatenate(region_ids))
+
+        best_matches = [None] * len(quotes)
+        for k, region_start, region_end, offset in regions:
+            alignment = self.align(quote_tokens[k], region_start, region_end, band, offset, tables[k])
+            if not alignment or alignment['score'] < threshold:
+                continue
+            if best_matches[k] is None or alignment['score'] > best_matches[k]['score']:
+                best_matches[k] = alignment
+
+        return {
+            quote: self._match(alignment) if alignment else None
+            for quote, alignment in zip(quotes, best_matches)
+        }
+
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Energy-based voice activity detection ahead of Whisper.
+Finds the speech regions of a recording, packs them into ~30 second chunks
+with the long pauses cut out, transcribes only those chunks and maps the
+timestamps back onto the original recording.
+"""
+
+import bisect
+
+import numpy as np
+import whisper
+
+# Whisper's input format: 16 kHz mono float32
+SAMPLE_RATE = 16000
+
+# Energy frames, and how far above the noise floor speech must be
+FRAME_MS = 30
+NOISE_PERCENTILE = 10
+SPEECH_MARGIN_DB = 10
+
+# Pauses shorter than this stay inside a region; regions are padded so
+# word onsets and trailing breaths are kept
+MIN_SILENCE_MS = 700
+SPEECH_PAD_MS = 200
+
+# Target length of the audio sent to the model in one call
+CHUNK_SECONDS = 30
+
+
+def speech_regions(samples, sample_rate=SAMPLE_RATE):
+    """
+    Find the speech regions of a mono recording.
+
+    A frame is speech if its energy is SPEECH_MARGIN_DB above the noise floor
+    (the NOISE_PERCENTILE-th percentile frame energy).
+
+    Args:
+        samples: Mono float32 samples
+        sample_rate: Sample rate of `samples`
+
+    Returns:
+        List of (start_sample, end_sample) regions in order
+    """
+    frame_len = int(sample_rate * FRAME_MS / 1000)
+    count = len(samples) // frame_len
+    if count == 0:
+        return [(0, len(samples))] if len(samples) else []
+
+    frames = samples[:count * frame_len].reshape(count, frame_len)
+    energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    speech = energy_db > np.percentile(energy_db, NOISE_PERCENTILE) + SPEECH_MARGIN_DB
+    if not speech.any():
+        return []
+
+    # Runs of speech frames as [start, end) frame pairs
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    min_silence = MIN_SILENCE_MS // FRAME_MS
+    pad = SPEECH_PAD_MS // FRAME_MS
+
+    regions = []
+    for start, end in zip(starts, ends):
+        start = max(0, start - pad)
+        end = min(count, end + pad)
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    # A region reaching the last frame keeps the trailing partial frame too
+    return [
+        (int(start * frame_len), len(samples) if end == count else int(end * frame_len))
+        for start, end in regions
+    ]
+
+
+def group_chunks(regions, sample_rate=SAMPLE_RATE, chunk_seconds=CHUNK_SECONDS):
+    """
+    Pack consecutive speech regions into chunks of about chunk_seconds.
+
+    A single region longer than that becomes a chunk of its own.
+
+    Returns:
+        List of chunks, each a list of (start_sample, end_sample) regions
+    """
+    limit = chunk_seconds * sample_rate
+    chunks = []
+    current = []
+    length = 0
+
+    for start, end in regions:
+        if current and length + (end - start) > limit:
+            chunks.append(current)
+            current = []
+            length = 0
+        current.append((start, end))
+        length += end - start
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def remap_time(t, pieces):
+    """
+    Map a time in a chunk back to the original recording.
+
+    Args:
+        t: Seconds from the start of the chunk
+        pieces: (chunk_start, original_start) pairs in seconds, one per
+            region in the chunk, in order
+
+    Returns:
+        Seconds from the start of the original recording
+    """
+    chunk_starts = [chunk_start for chunk_start, _ in pieces]
+    i = max(0, bisect.bisect_right(chunk_starts, t) - 1)
+    chunk_start, original_start = pieces[i]
+    return round(original_start + (t - chunk_start), 3)
+
+
+def _remap_segment(segment, pieces, segment_id):
+    segment = dict(
+        segment,
+        id=segment_id,
+        start=remap_time(segment['start'], pieces),
+        end=remap_time(segment['end'], pieces)
+    )
+    if 'words' in segment:
+        segment['words'] = [
+            dict(w, start=remap_time(w['start'], pieces), end=remap_time(w['end'], pieces))
+            for w in segment['words']
+        ]
+    return segment
+
+
+def transcribe_with_vad(model, audio_file, **options):
+    """
+    Transcribe only the speech in an audio file.
+
+    Args:
+        model: Loaded Whisper model
+        audio_file: Path to the audio file
+        **options: Passed to model.transcribe() (e.g. word_timestamps=True)
+
+    Returns:
+        Whisper result dictionary with timestamps on the original timeline
+    """
+    samples = whisper.load_audio(str(audio_file))
+    regions = speech_regions(samples)
+
+    kept = sum(end - start for start, end in regions)
+    print(f"VAD: transcribing {kept / SAMPLE_RATE:.0f}s of speech "
+          f"out of {len(samples) / SAMPLE_RATE:.0f}s")
+
+    segments = []
+    language = None
+
+    for chunk in group_chunks(regions):
+        pieces = []
+        position = 0
+        for start, end in chunk:
+            pieces.append((position / SAMPLE_RATE, start / SAMPLE_RATE))
+            position += end - start
+
+        chunk_samples = np.concatenate([samples[start:end] for start, end in chunk])
+        result = model.transcribe(chunk_samples, **options)
+        language = language or result.get('language')
+
+        for segment in result['segments']:
+            segments.append(_remap_segment(segment, pieces, len(segments)))
+
+    return {
+        'text': ''.join(s['text'] for s in segments),
+        'segments': segments,
+        'language': language
+    }
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Verify extracted clips offline.
+Each clip's text is read from the source recording's transcript (the words
+between the clip's start_ms and end_ms in metadata.json, or in the EDL for
+hand-cut alternates), so all the clips are checked in seconds with no
+network access. With --audio, the clip WAVs are also transcribed with a
+local Whisper model, in batches, and compared with the transcript text.
+
+Writes transcriptions.json in the same shape as transcribe_all.py.
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+import whisper
+from fuzzywuzzy import fuzz
+
+from edl import EDL_FILE, load_edl
+from extract_clips import get_extractor, get_model
+from parallel_transcribe import trim_segments
+
+# Whisper decodes at most 30 seconds at once; longer clips are transcribed
+# one at a time
+BATCH_SECONDS = 30
+BATCH_SIZE = 8
+
+# Audio and transcript text this similar count as agreeing
+AGREEMENT_THRESHOLD = 80
+
+# script_<n>_clip_<m>.wav, with an optional letter for alternates
+CLIP_FILE = re.compile(r'script_(\d+)_clip_(\d+)[a-z]*\.wav$')
+
+
+def load_clips(base_dir=".", edl_file=EDL_FILE):
+    """
+    Collect every clip in the script folders.
+
+    Covers the clips in script_*/metadata.json and every
+    script_*/script_<n>_clip_<m>*.wav on disk, including hand-cut alternates
+    such as script_1_clip_01a.wav. A WAV not described in metadata.json takes
+    its range from the EDL record of the same name. If it has none, it is
+    still listed, with start_ms and end_ms of None.
+
+    Returns:
+        List of dicts with script, num, file, source_file, start_ms, end_ms
+    """
+    base_dir = Path(base_dir)
+    edl_clips = load_edl(base_dir / edl_file)["clips"]
+    clips = {}
+
+    for metadata_path in base_dir.glob("script_*/metadata.json"):
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+
+        script_num = int(metadata_path.parent.name.split('_')[1])
+        for clip in metadata['clips']:
+            if clip['status'] != 'success':
+                continue
+            file = f"{metadata_path.parent.name}/{clip['filename']}"
+            clips[file] = {
+                'script': script_num,
+                'num': clip['clip_number'],
+                'file': file,
+                'source_file': clip.get('source_file', metadata['source_file']),
+                'start_ms': clip['start_ms'],
+                'end_ms': clip['end_ms']
+            }
+
+    for wav_path in base_dir.glob("script_*/script_*_clip_*.wav"):
+        file = f"{wav_path.parent.name}/{wav_path.name}"
+        match = CLIP_FILE.match(wav_path.name)
+        if file in clips or not match:
+            continue
+
+        # A record cut from the WAV itself says nothing about its source
+        record = edl_clips.get(wav_path.stem)
+        if record and Path(record['source']).resolve() == wav_path.resolve():
+            record = None
+        clips[file] = {
+            'script': int(match.group(1)),
+            'num': int(match.group(2)),
+            'file': file,
+            'source_file': record['source'] if record else None,
+            'start_ms': record['start_ms'] if record else None,
+            'end_ms': record['end_ms'] if record else None
+        }
+
+    return sorted(clips.values(), key=lambda c: (c['script'], c['num'], c['file']))
+
+
+def transcript_text(transcription, start_ms, end_ms):
+    """Return the transcript words whose midpoint falls inside [start_ms, end_ms]."""
+    segments = trim_segments(transcription['segments'], start_ms / 1000, end_ms / 1000)
+    return ' '.join(''.join(s['text'] for s in segments).split())
+
+
+def transcribe_clip_audio(files, model_size="base"):
+    """
+    Transcribe clip WAVs with a local Whisper model.
+
+    Clips up to 30 seconds are padded to Whisper's window and decoded
+    BATCH_SIZE at a time in a single forward pass; longer clips go through
+    model.transcribe().
+
+    Returns:
+        Dict of file -> text
+    """
+    import torch
+
+    model = get_model(model_size)
+    options = whisper.DecodingOptions(language="en", without_timestamps=True,
+                                      fp16=model.device.type == "cuda")
+    texts = {}
+    short = []
+
+    for file in files:
+        audio = whisper.load_audio(file)
+        if len(audio) > BATCH_SECONDS * whisper.audio.SAMPLE_RATE:
+            texts[file] = model.transcribe(audio, language="en", verbose=None)['text'].strip()
+        else:
+            short.append((file, audio))
+
+    for i in range(0, len(short), BATCH_SIZE):
+        batch = short[i:i + BATCH_SIZE]
+        print(f"  Decoding clips {i + 1}-{i + len(batch)} of {len(short)}...")
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels)
+            for _, audio in batch
+        ]).to(model.device)
+        for (file, _), result in zip(batch, whisper.decode(model, mel, options)):
+            texts[file] = result.text.strip()
+
+    return texts
+
+
+def verify_clips(clips, model_size="base", transcript_source="auto", audio=False):
+    """
+    Get each clip's text, from the transcripts and optionally from its audio.
+
+    Args:
+        clips: Clips from load_clips()
+        model_size: Whisper model for cached transcripts and --audio
+        transcript_source: "whisper", "fireflies" or "auto"
+        audio: Also transcribe the clip files and compare
+
+    Returns:
+        Dict of script number -> list of {num, file, text}, as in
+        transcribe_all.py
+    """
+    transcriptions = {}
+    for source_file in dict.fromkeys(c['source_file'] for c in clips if c['source_file']):
+        extractor = get_extractor(source_file, model_size, transcript_source=transcript_source)
+        transcriptions[source_file] = extractor.transcribe()
+
+    audio_texts = {}
+    if audio:
+        files = [c['file'] for c in clips if Path(c['file']).exists()]
+        print(f"\nTranscribing {len(files)} clip files...")
+        audio_texts = transcribe_clip_audio(files, model_size)
+
+    results = {}
+    disagreements = 0
+    unknown = 0
+
+    for clip in clips:
+        if clip['start_ms'] is None:
+            # No metadata or EDL range: only the audio can say what it holds
+            unknown += 1
+            print(f"⚠️  Script {clip['script']}, Clip {clip['num']}: no known range for {clip['file']}")
+            text = audio_texts.get(clip['file'], f"[No known range: {clip['file']}]")
+            results.setdefault(clip['script'], []).append({
+                'num': clip['num'],
+                'file': clip['file'],
+                'text': text
+            })
+            continue
+
+        text = transcript_text(transcriptions[clip['source_file']], clip['start_ms'], clip['end_ms'])
+        print(f"Script {clip['script']}, Clip {clip['num']}: {text[:80]}...")
+
+        if audio:
+            if clip['file'] not in audio_texts:
+                print(f"   ✗ Missing file: {clip['file']}")
+                text = f"[Missing file: {clip['file']}]"
+            else:
+                score = fuzz.ratio(text.lower(), audio_texts[clip['file']].lower())
+                if score < AGREEMENT_THRESHOLD:
+                    disagreements += 1
+                    print(f"   ⚠️  Audio differs (score: {score}%): {audio_texts[clip['file']][:80]}...")
+                else:
+                    print(f"   ✓ Audio agrees (score: {score}%)")
+                text = audio_texts[clip['file']]
+
+        results.setdefault(clip['script'], []).append({
+            'num': clip['num'],
+            'file': clip['file'],
+            'text': text
+        })
+
+    if unknown:
+        print(f"\n⚠️  {unknown} clips have no known range in metadata.json or the EDL")
+    if audio:
+        checked = len(clips) - unknown
+        print(f"\n{checked - disagreements}/{checked} clips match their transcript")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Verify extracted clips against the source transcripts, offline'
+    )
+    parser.add_argument('--audio', action='store_true',
+                        help='Also transcribe the clip files with a local Whisper model and compare')
+    parser.add_argument('--model', default='base',
+                        choices=['tiny', 'base', 'small', 'medium', 'large'],
+                        help='Whisper model size (default: base)')
+    parser.add_argument('--transcript', default='auto',
+                        choices=['whisper', 'fireflies', 'auto'],
+                        help="Transcript to read clip text from (default: auto)")
+    parser.add_argument('--output', default='transcriptions.json',
+                        help='Output file (default: transcriptions.json)')
+
+    args = parser.parse_args()
+
+    clips = load_clips()
+    if not clips:
+        print("✗ No clips found in script_*/metadata.json or script_*/*.wav")
+        return 1
+
+    print(f"Verifying {len(clips)} clips...\n")
+    results = verify_clips(clips, args.model, args.transcript, args.audio)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\n✓ Done! Transcriptions saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
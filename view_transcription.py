@@ -7,20 +7,49 @@ import whisper
 import argparse
 import json
 
+from transcript_cache import cached_transcribe, transcribe_options
+from parallel_transcribe import transcribe_parallel
+from vad import transcribe_with_vad
+
 def main():
     parser = argparse.ArgumentParser(description='View audio transcription')
     parser.add_argument('audio_file', help='Path to the audio file')
     parser.add_argument('--model', default='base', help='Whisper model size')
     parser.add_argument('--output', help='Output file for full transcription (JSON)')
     parser.add_argument('--search', help='Search for a phrase in the transcription')
+    parser.add_argument('--vad', action='store_true', help='Skip silence before transcribing (faster on CPU)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Transcribe in chunks across this many processes (default: 1)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the transcript cache')
+    parser.add_argument('--refresh', action='store_true', help='Re-transcribe and overwrite the cached transcription')
 
     args = parser.parse_args()
 
-    print(f"Loading Whisper model: {args.model}")
-    model = whisper.load_model(args.model)
+    if args.vad and args.workers > 1:
+        print("⚠️  --workers is ignored with --vad (the speech is transcribed in one process)")
+
+    def run_whisper():
+        if args.workers > 1 and not args.vad:
+            print(f"Transcribing audio: {args.audio_file}")
+            return transcribe_parallel(args.audio_file, args.model, workers=args.workers,
+                                       word_timestamps=True, verbose=False)
+
+        print(f"Loading Whisper model: {args.model}")
+        model = whisper.load_model(args.model)
+
+        print(f"Transcribing audio: {args.audio_file}")
+        if args.vad:
+            return transcribe_with_vad(model, args.audio_file, word_timestamps=True, verbose=False)
+        return model.transcribe(args.audio_file, word_timestamps=True, verbose=False)
 
-    print(f"Transcribing audio: {args.audio_file}")
-    result = model.transcribe(args.audio_file, word_timestamps=True, verbose=False)
+    result = cached_transcribe(
+        args.audio_file,
+        args.model,
+        run_whisper,
+        options=transcribe_options(args.vad, args.workers),
+        use_cache=not args.no_cache,
+        refresh=args.refresh
+    )
 
     print("\n" + "="*80)
     print("FULL TRANSCRIPTION")
@@ -0,0 +1,76 @@
+// Waveforms for the clip players, drawn from the small .peaks file next to
+// each clip WAV (format in peaks.py) before any audio is downloaded. Click a
+// waveform to seek. Include after the page's <audio> elements, along with
+// waveform.css.
+function readPeaks(buffer) {
+    const view = new DataView(buffer);
+    if (String.fromCharCode(...new Uint8Array(buffer, 0, 4)) !== 'PEAK') return null;
+    const levelCount = view.getUint16(6, true);
+    const levels = [];
+    let offset = 16 + levelCount * 8;
+    for (let i = 0; i < levelCount; i++) {
+        const count = view.getUint32(20 + i * 8, true);
+        levels.push(new Int8Array(buffer, offset, count * 2));
+        offset += count * 2;
+    }
+    return { sampleRate: view.getUint32(8, true), frames: view.getUint32(12, true), levels };
+}
+
+function drawWaveform(canvas, data, progress) {
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+    const ratio = window.devicePixelRatio || 1;
+    canvas.width = width * ratio;
+    canvas.height = height * ratio;
+    const ctx = canvas.getContext('2d');
+    ctx.scale(ratio, ratio);
+
+    // Coarsest zoom level that still has a peak for every pixel
+    let peaks = data.levels[0];
+    for (const level of data.levels) {
+        if (level.length / 2 >= width) peaks = level;
+    }
+
+    const count = peaks.length / 2;
+    const middle = height / 2;
+    for (let x = 0; x < width; x++) {
+        const start = Math.floor(x * count / width);
+        const end = Math.max(start + 1, Math.floor((x + 1) * count / width));
+        let low = 0;
+        let high = 0;
+        for (let i = start; i < Math.min(end, count); i++) {
+            low = Math.min(low, peaks[2 * i]);
+            high = Math.max(high, peaks[2 * i + 1]);
+        }
+        ctx.fillStyle = x < progress * width ? '#2c5f2d' : '#97bc62';
+        ctx.fillRect(x, middle - high / 127 * middle, 1, Math.max(1, (high - low) / 127 * middle));
+    }
+}
+
+document.querySelectorAll('audio').forEach(audio => {
+    const wav = audio.querySelector('source[src$=".wav"]');
+    if (!wav) return;
+
+    fetch(wav.getAttribute('src').replace(/\.wav$/, '.peaks'))
+        .then(response => response.ok ? response.arrayBuffer() : null)
+        .then(buffer => {
+            const data = buffer && readPeaks(buffer);
+            if (!data) return;
+
+            const canvas = document.createElement('canvas');
+            canvas.className = 'waveform';
+            audio.parentNode.insertBefore(canvas, audio);
+
+            const duration = data.frames / data.sampleRate;
+            const redraw = () => drawWaveform(canvas, data, audio.currentTime / duration);
+            audio.addEventListener('timeupdate', redraw);
+            audio.addEventListener('seeked', redraw);
+            window.addEventListener('resize', redraw);
+            canvas.addEventListener('click', event => {
+                const rect = canvas.getBoundingClientRect();
+                audio.currentTime = (event.clientX - rect.left) / rect.width * duration;
+            });
+            redraw();
+        })
+        .catch(() => {});
+});